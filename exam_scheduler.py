@@ -33,7 +33,7 @@ class ExamScheduler:
             for department in DEPARTMENTS:
                 # Filter for department
                 if 'Department' in sem_courses_parsed.columns:
-                    dept_mask = sem_courses_parsed['Department'].astype(str).str.contains(f"^{department}$", na=False, regex=True)
+                    dept_mask = sem_courses_parsed['Department'].astype(str).str.strip().eq(department)
                     dept_courses = sem_courses_parsed[dept_mask].copy()
                 else:
                     dept_courses = sem_courses_parsed.copy()
@@ -84,7 +84,7 @@ class ExamScheduler:
             for department in DEPARTMENTS:
                 # Filter for department
                 if 'Department' in sem_courses_parsed.columns:
-                    dept_mask = sem_courses_parsed['Department'].astype(str).str.contains(f"^{department}$", na=False, regex=True)
+                    dept_mask = sem_courses_parsed['Department'].astype(str).str.strip().eq(department)
                     dept_courses = sem_courses_parsed[dept_mask].copy()
                 else:
                     dept_courses = sem_courses_parsed.copy()
@@ -390,38 +390,27 @@ class ExamScheduler:
             header_font = Font(bold=True, size=11)
             header_alignment = Alignment(horizontal='center', vertical='center', wrap_text=True)
             
-            # Calculate column widths
-            column_widths = {}
-            for col_idx in range(1, max_col + 1):
-                col_letter = get_column_letter(col_idx)
-                max_length = 0
-                
-                for row_idx in range(1, max_row + 1):
-                    cell = worksheet.cell(row=row_idx, column=col_idx)
-                    if cell.value is not None:
-                        cell_value = str(cell.value)
-                        max_length = max(max_length, len(cell_value))
+            cell_alignment = Alignment(horizontal='center', vertical='center', wrap_text=True)
+            
+            # Calculate column widths (one iter_cols pass over the values)
+            for col_idx, values in enumerate(worksheet.iter_cols(min_row=1, max_row=max_row, max_col=max_col, values_only=True), start=1):
+                max_length = max((len(str(value)) for value in values if value is not None), default=0)
                 
                 # Set appropriate width
                 if max_length > 30:
-                    column_widths[col_letter] = min(max(20, max_length * 0.6), 50)
+                    width = min(max(20, max_length * 0.6), 50)
                 else:
-                    column_widths[col_letter] = min(max(15, max_length * 1.2), 35)
+                    width = min(max(15, max_length * 1.2), 35)
+                worksheet.column_dimensions[get_column_letter(col_idx)].width = width
             
             # Apply formatting
-            for row_idx in range(1, max_row + 1):
-                for col_idx in range(1, max_col + 1):
-                    cell = worksheet.cell(row=row_idx, column=col_idx)
-                    col_letter = get_column_letter(col_idx)
-                    
+            for row_idx, row in enumerate(worksheet.iter_rows(min_row=1, max_row=max_row, max_col=max_col), start=1):
+                for cell in row:
                     if row_idx == start_row:
                         cell.font = header_font
                         cell.alignment = header_alignment
                     else:
-                        cell.alignment = Alignment(horizontal='center', vertical='center', wrap_text=True)
-                    
-                    if col_letter in column_widths:
-                        worksheet.column_dimensions[col_letter].width = column_widths[col_letter]
+                        cell.alignment = cell_alignment
             
             # Set row heights
             if start_row <= max_row:
@@ -451,31 +440,21 @@ class ExamScheduler:
             cell_alignment = Alignment(horizontal='center', vertical='center', wrap_text=True)
             left_alignment = Alignment(horizontal='left', vertical='center', wrap_text=True)
             
-            # Calculate column widths
-            column_widths = {}
-            for col_idx in range(1, max_col + 1):
-                col_letter = get_column_letter(col_idx)
-                max_length = 0
-                
-                for row_idx in range(1, max_row + 1):
-                    cell = worksheet.cell(row=row_idx, column=col_idx)
-                    if cell.value is not None:
-                        cell_value = str(cell.value)
-                        max_length = max(max_length, len(cell_value))
+            # Calculate column widths (one iter_cols pass over the values)
+            for col_idx, values in enumerate(worksheet.iter_cols(min_row=1, max_row=max_row, max_col=max_col, values_only=True), start=1):
+                max_length = max((len(str(value)) for value in values if value is not None), default=0)
                 
                 # First column (labels) - narrower
                 if col_idx == 1:
-                    column_widths[col_letter] = max(20, min(max_length * 1.1, 30))
+                    width = max(20, min(max_length * 1.1, 30))
                 else:
                     # Day columns - wider for course codes
-                    column_widths[col_letter] = max(15, min(max_length * 0.8, 40))
+                    width = max(15, min(max_length * 0.8, 40))
+                worksheet.column_dimensions[get_column_letter(col_idx)].width = width
             
             # Apply formatting
-            for row_idx in range(1, max_row + 1):
-                for col_idx in range(1, max_col + 1):
-                    cell = worksheet.cell(row=row_idx, column=col_idx)
-                    col_letter = get_column_letter(col_idx)
-                    
+            for row_idx, row in enumerate(worksheet.iter_rows(min_row=1, max_row=max_row, max_col=max_col), start=1):
+                for col_idx, cell in enumerate(row, start=1):
                     cell_value = str(cell.value) if cell.value is not None else ''
                     
                     # Format section headers (FN and AN rows)
@@ -500,10 +479,6 @@ class ExamScheduler:
                         cell.alignment = left_alignment
                     else:
                         cell.alignment = cell_alignment
-                    
-                    # Apply column width
-                    if col_letter in column_widths:
-                        worksheet.column_dimensions[col_letter].width = column_widths[col_letter]
             
             # Set row heights
             worksheet.row_dimensions[1].height = 25  # FN header
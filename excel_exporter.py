@@ -1,6 +1,8 @@
 """Excel export utilities."""
 import os
 import time
+from collections import defaultdict
+from functools import lru_cache
 import pandas as pd
 from file_manager import FileManager
 from config import DEPARTMENTS, TARGET_SEMESTERS, PRE_MID, POST_MID
@@ -8,6 +10,66 @@ from excel_loader import ExcelLoader
 from openpyxl.styles import PatternFill, Alignment, Font
 from openpyxl.utils import get_column_letter
 
+class _BasketRoomAllocator:
+    """Classroom allocation state for the 7th sem Basket_Assignments sheet.
+    Rooms are handed out round-robin from a shared index, and a basket avoids rooms already used by its
+    other courses while it can."""
+    
+    def __init__(self, rooms):
+        self.rooms = rooms
+        # Stable bit position for each room name
+        self.room_idx = {name: i for i, (name, _) in enumerate(rooms)}
+        # Key: (basket_code, course_code), Value: room_name
+        self.course_room_map = {}
+        # Distinct rooms handed out so far (kept in step with course_room_map)
+        self.unique_allocated_rooms = set()
+        # Key: basket_code, Value: int bitmask of room indices already used
+        self.basket_used_rooms = defaultdict(int)
+        # Global room index for sequential allocation
+        self.room_index = 0
+    
+    def _assign(self, basket_code, course_key, room):
+        self.course_room_map[course_key] = room
+        self.unique_allocated_rooms.add(room)
+        self.basket_used_rooms[basket_code] |= 1 << self.room_idx[room]
+        return room
+    
+    def _is_used(self, basket_code, room):
+        return (self.basket_used_rooms[basket_code] >> self.room_idx[room]) & 1
+    
+    def allocate_course(self, basket_code, course_code):
+        """Room for a course of a basket (different room for each course in same basket), '' without rooms."""
+        course_key = (basket_code, course_code)
+        if course_key in self.course_room_map:
+            return self.course_room_map[course_key]
+        n_rooms = len(self.rooms)
+        # Once every room is taken in this basket reuse is unavoidable,
+        # so a single cycle from room_index either finds an unused room
+        # or takes the first candidate
+        allow_reuse = bin(self.basket_used_rooms[basket_code]).count('1') >= n_rooms
+        for i in range(n_rooms):
+            idx = (self.room_index + i) % n_rooms
+            candidate_room = self.rooms[idx][0]
+            if allow_reuse or not self._is_used(basket_code, candidate_room):
+                self.room_index = (idx + 1) % n_rooms
+                return self._assign(basket_code, course_key, candidate_room)
+        return ''
+    
+    def allocate_basket(self, basket_code):
+        """Room for a basket-only row, falling back to the first room once the basket has used them all."""
+        course_key = (basket_code, '')
+        if course_key in self.course_room_map:
+            return self.course_room_map[course_key]
+        if not self.rooms:
+            return ''
+        # Find next available room not used in this basket
+        for _ in range(len(self.rooms)):
+            candidate_room = self.rooms[self.room_index][0]
+            self.room_index = (self.room_index + 1) % len(self.rooms)
+            if not self._is_used(basket_code, candidate_room):
+                return self._assign(basket_code, course_key, candidate_room)
+        return self._assign(basket_code, course_key, self.rooms[0][0])
+
 class ExcelExporter:
     """Handles exporting of timetables to Excel files."""
     
@@ -50,13 +112,15 @@ class ExcelExporter:
             self._course_color_map[course] = self._palette[idx]
         return self._course_color_map[course]
     
-    def _format_worksheet(self, worksheet, has_index=True, start_row=1):
+    def _format_worksheet(self, worksheet, has_index=True, start_row=1, source_df=None):
         """Format worksheet to ensure all text is clearly visible.
         - Auto-adjusts column widths
         - Enables text wrapping
         - Sets appropriate row heights
         - Formats headers (bold, center)
-        - Sets alignment for data cells"""
+        - Sets alignment for data cells
+        If source_df is given (written with index=False at start_row), cell
+        values are taken from it instead of being read back from the sheet."""
         try:
             # Find the maximum column and row with data
             max_row = worksheet.max_row
@@ -65,6 +129,23 @@ class ExcelExporter:
             if max_row == 0 or max_col == 0:
                 return
             
+            # Value lookup: read from the source frame when available so the
+            # written cells are not scanned again for widths and heights
+            if source_df is not None and not has_index:
+                value_rows = {start_row: [str(c) for c in source_df.columns]}
+                for offset, row_vals in enumerate(source_df.itertuples(index=False, name=None), start=1):
+                    value_rows[start_row + offset] = [None if pd.isna(v) else v for v in row_vals]
+            else:
+                # One values-only pass over the sheet instead of a worksheet.cell() call per lookup
+                value_rows = dict(enumerate(
+                    worksheet.iter_rows(min_row=1, max_row=max_row, max_col=max_col, values_only=True), start=1))
+            
+            def _value_at(row_idx, col_idx):
+                row_vals = value_rows.get(row_idx)
+                if row_vals is None or col_idx > len(row_vals):
+                    return None
+                return row_vals[col_idx - 1]
+            
             # Format header row
             header_font = Font(bold=True, size=11)
             header_alignment = Alignment(horizontal='center', vertical='center', wrap_text=True)
@@ -78,24 +159,27 @@ class ExcelExporter:
             # Get header row to identify column types
             header_row = {}
             for col_idx in range(1, max_col + 1):
-                cell = worksheet.cell(row=start_row, column=col_idx)
-                if cell.value is not None:
-                    header_value = str(cell.value).lower().strip()
+                value = _value_at(start_row, col_idx)
+                if value is not None:
+                    header_value = str(value).lower().strip()
                     header_row[col_idx] = header_value
             
+            # Column letters by 1-based index, computed once per sheet
+            col_letters = [None] + [get_column_letter(col_idx) for col_idx in range(1, max_col + 1)]
+            
             # First pass: calculate optimal column widths
             column_widths = {}
             for col_idx in range(1, max_col + 1):
-                col_letter = get_column_letter(col_idx)
+                col_letter = col_letters[col_idx]
                 max_length = 0
                 avg_length = 0
                 count = 0
                 
                 # Check all cells in this column
                 for row_idx in range(start_row, max_row + 1):
-                    cell = worksheet.cell(row=row_idx, column=col_idx)
-                    if cell.value is not None:
-                        cell_value = str(cell.value)
+                    value = _value_at(row_idx, col_idx)
+                    if value is not None:
+                        cell_value = str(value)
                         cell_length = len(cell_value)
                         max_length = max(max_length, cell_length)
                         avg_length += cell_length
@@ -169,33 +253,32 @@ class ExcelExporter:
                         # Short text - adjust based on content (1 character ≈ 1.1 units)
                         column_widths[col_letter] = min(max(10, max_length * 1.1), 30)
             
-            # Second pass: apply formatting and column widths
-            for row_idx in range(1, max_row + 1):
-                for col_idx in range(1, max_col + 1):
-                    cell = worksheet.cell(row=row_idx, column=col_idx)
-                    col_letter = get_column_letter(col_idx)
-                    
+            # Data cell alignment per column (decided once from the header, not per cell):
+            # left align course names and faculty for better readability, center align other data
+            left_alignment = Alignment(horizontal='left', vertical='center', wrap_text=True)
+            center_alignment = Alignment(horizontal='center', vertical='center', wrap_text=True)
+            data_alignments = []
+            for col_idx in range(1, max_col + 1):
+                header_val = header_row.get(col_idx, '').lower()
+                is_course_name = any(keyword in header_val for keyword in course_name_headers)
+                is_faculty = any(keyword in header_val for keyword in faculty_headers)
+                data_alignments.append(left_alignment if is_course_name or is_faculty else center_alignment)
+            
+            # Second pass: apply formatting
+            for row_idx, row in enumerate(worksheet.iter_rows(min_row=1, max_row=max_row, max_col=max_col), start=1):
+                if row_idx == start_row:
                     # Format header row
-                    if row_idx == start_row:
+                    for cell in row:
                         cell.font = header_font
                         cell.alignment = header_alignment
-                    else:
-                        # Format data cells - wrap text
-                        # Left align for course names and faculty, center align for others
-                        header_val = header_row.get(col_idx, '').lower()
-                        is_course_name = any(keyword in header_val for keyword in course_name_headers)
-                        is_faculty = any(keyword in header_val for keyword in faculty_headers)
-                        
-                        if is_course_name or is_faculty:
-                            # Left align course names and faculty for better readability
-                            cell.alignment = Alignment(horizontal='left', vertical='center', wrap_text=True)
-                        else:
-                            # Center align other data
-                            cell.alignment = Alignment(horizontal='center', vertical='center', wrap_text=True)
-                    
-                    # Apply column width
-                    if col_letter in column_widths:
-                        worksheet.column_dimensions[col_letter].width = column_widths[col_letter]
+                else:
+                    # Format data cells - wrap text
+                    for cell, alignment in zip(row, data_alignments):
+                        cell.alignment = alignment
+            
+            # Apply column widths once per column
+            for col_letter, width in column_widths.items():
+                worksheet.column_dimensions[col_letter].width = width
             
             # Set row heights for better visibility
             # Header row
@@ -208,12 +291,11 @@ class ExcelExporter:
                 has_content = False
                 max_lines = 1
                 for col_idx in range(1, max_col + 1):
-                    cell = worksheet.cell(row=row_idx, column=col_idx)
-                    if cell.value is not None:
+                    value = _value_at(row_idx, col_idx)
+                    if value is not None:
                         has_content = True
-                        cell_value = str(cell.value)
-                        col_letter = get_column_letter(col_idx)
-                        col_width = column_widths.get(col_letter, 12)
+                        cell_value = str(value)
+                        col_width = column_widths.get(col_letters[col_idx], 12)
                         # Estimate lines needed: approximately 10-12 characters per unit of width
                         chars_per_line = max(col_width * 0.85, 8)  # More conservative estimate
                         lines = max(1, len(cell_value) / chars_per_line)
@@ -276,7 +358,7 @@ class ExcelExporter:
             
             # Filter for department
             if 'Department' in sem_courses_parsed.columns:
-                dept_mask = sem_courses_parsed['Department'].astype(str).str.contains(f"^{department}$", na=False, regex=True)
+                dept_mask = sem_courses_parsed['Department'].astype(str).str.strip().eq(department)
                 dept_courses = sem_courses_parsed[dept_mask].copy()
             else:
                 dept_courses = sem_courses_parsed.copy()
@@ -1017,6 +1099,100 @@ class ExcelExporter:
         except Exception as e:
             print(f"  WARNING: Could not add Minor sheet: {e}")
     
+    @staticmethod
+    @lru_cache(maxsize=None)
+    def _detect_sem7_columns(columns):
+        """Resolve (basket, course code, course name, faculty) columns of the 7th sem sheet.
+        Takes a tuple of column labels so the result can be cached across exports."""
+        # Each header is lower-cased once; like the original loop, the last matching header wins
+        basket_col = None
+        course_code_col = None
+        course_name_col = None
+        faculty_col = None
+        
+        for col in columns:
+            col_lower = str(col).lower()
+            if 'basket' in col_lower:
+                basket_col = col
+            elif 'course code' in col_lower:
+                course_code_col = col
+            elif col_lower == 'course' or 'course name' in col_lower:
+                course_name_col = col
+            elif 'faculty' in col_lower or 'instructor' in col_lower:
+                faculty_col = col
+        return basket_col, course_code_col, course_name_col, faculty_col
+    
+    def _build_basket_assignments_from_sheet(self, sem7_sheet_df, course_df, allocator):
+        """Build Basket_Assignments rows from the 7th sem sheet, allocating classrooms with allocator."""
+        rows = []
+        basket_col, course_code_col, course_name_col, faculty_col = self._detect_sem7_columns(
+            tuple(sem7_sheet_df.columns)
+        )
+        if not (basket_col and course_code_col):
+            return rows
+        
+        for _, row in sem7_sheet_df.iterrows():
+            basket_code = str(row.get(basket_col, '')).strip()
+            course_code = str(row.get(course_code_col, '')).strip()
+            course_name = str(row.get(course_name_col, '')).strip() if course_name_col else ''
+            instructor = str(row.get(faculty_col, '')).strip() if faculty_col else ''
+            
+            # Allocate classroom for this course (different room for each course in same basket)
+            allocated_room = ''
+            if basket_code and course_code:
+                allocated_room = allocator.allocate_course(basket_code, course_code)
+            
+            # Try to get additional info from main course data if available
+            dept = ''
+            ltpsc = ''
+            credits = ''
+            
+            if not course_df.empty and 'Course Code' in course_df.columns:
+                course_match = course_df[course_df['Course Code'].astype(str) == course_code]
+                if not course_match.empty:
+                    match_row = course_match.iloc[0]
+                    dept = str(match_row.get('Department', '')) if 'Department' in match_row else ''
+                    ltpsc = str(match_row.get('LTPSC', '')) if 'LTPSC' in match_row else ''
+                    credits = str(match_row.get('Credits', '')) if 'Credits' in match_row else ''
+            
+            rows.append({
+                'Basket Code': basket_code,
+                'Course Code': course_code,
+                'Course Name': course_name,
+                'Department': dept,
+                'LTPSC': ltpsc,
+                'Credits': credits,
+                'Instructor': instructor,
+                'Classroom Allocated': allocated_room
+            })
+        
+        return rows
+    
+    def _build_basket_assignments_fallback(self, baskets, allocator):
+        """Build one Basket_Assignments row per basket when no 7th sem sheet exists."""
+        rows = []
+        if baskets.empty:
+            return rows
+        
+        for _, basket_row in baskets.iterrows():
+            basket_code = str(basket_row.get('Course Code', ''))
+            
+            # Allocate classroom for this basket
+            allocated_room = allocator.allocate_basket(basket_code) if basket_code else ''
+            
+            rows.append({
+                'Basket Code': basket_code,
+                'Course Code': '',
+                'Course Name': '',
+                'Department': '',
+                'LTPSC': '',
+                'Credits': '',
+                'Instructor': '',
+                'Classroom Allocated': allocated_room
+            })
+        
+        return rows
+    
     def export_semester7_timetable(self):
         """Export special unified timetable for 7th semester with baskets.
         Creates:
@@ -1171,7 +1347,9 @@ class ExcelExporter:
                 
                 # 2. Create basket assignments sheet
                 # Check if there's a "7th sem " sheet with basket assignments
-                basket_assignments = pd.DataFrame(columns=['Basket Code', 'Course Code', 'Course Name', 'Department', 'LTPSC', 'Credits', 'Instructor', 'Classroom Allocated'])
+                # Rows are collected as plain dicts and turned into one frame at the end
+                basket_columns = ['Basket Code', 'Course Code', 'Course Name', 'Department', 'LTPSC', 'Credits', 'Instructor', 'Classroom Allocated']
+                basket_rows = []
                 
                 # Get non-lab classrooms for basket allocation
                 nonlab_rooms = []
@@ -1185,13 +1363,7 @@ class ExcelExporter:
                                   if name and name not in lab_room_names and name.upper() != 'C004']
                 
                 # Track room allocation per course within each basket
-                # Key: (basket_code, course_code), Value: room_name
-                course_room_map = {}
-                # Track rooms used per basket to ensure different rooms for courses in same basket
-                # Key: basket_code, Value: set of room_names already used
-                basket_used_rooms = {}
-                # Track global room index for sequential allocation
-                room_index = 0
+                allocator = _BasketRoomAllocator(nonlab_rooms)
                 
                 # Look for 7th sem sheet in data_frames
                 sem7_sheet_key = None
@@ -1205,165 +1377,24 @@ class ExcelExporter:
                 if sem7_sheet_key and sem7_sheet_key in self.dfs:
                     sem7_sheet_df = self.dfs[sem7_sheet_key]
                     print(f"    Found 7th semester sheet: {sem7_sheet_key} with {len(sem7_sheet_df)} courses")
-                    
-                    # Map columns from the sheet to our format
-                    basket_col = None
-                    course_code_col = None
-                    course_name_col = None
-                    faculty_col = None
-                    
-                    for col in sem7_sheet_df.columns:
-                        col_lower = str(col).lower()
-                        if 'basket' in col_lower:
-                            basket_col = col
-                        elif 'course code' in col_lower:
-                            course_code_col = col
-                        elif col_lower == 'course' or 'course name' in col_lower:
-                            course_name_col = col
-                        elif 'faculty' in col_lower or 'instructor' in col_lower:
-                            faculty_col = col
-                    
-                    if basket_col and course_code_col:
-                        # Build basket assignments dataframe
-                        for _, row in sem7_sheet_df.iterrows():
-                            basket_code = str(row.get(basket_col, '')).strip()
-                            course_code = str(row.get(course_code_col, '')).strip()
-                            course_name = str(row.get(course_name_col, '')).strip() if course_name_col else ''
-                            instructor = str(row.get(faculty_col, '')).strip() if faculty_col else ''
-                            
-                            # Allocate classroom for this course (different room for each course in same basket)
-                            allocated_room = ''
-                            course_key = (basket_code, course_code)
-                            
-                            if basket_code and course_code:
-                                # Check if this course already has a room assigned
-                                if course_key in course_room_map:
-                                    allocated_room = course_room_map[course_key]
-                                else:
-                                    # Get rooms already used for other courses in this basket
-                                    used_rooms = basket_used_rooms.get(basket_code, set())
-                                    
-                                    # Find next available room not used in this basket
-                                    found_room = False
-                                    start_index = room_index
-                                    
-                                    # Try to find a room not used in this basket
-                                    for _ in range(len(nonlab_rooms)):
-                                        if nonlab_rooms and room_index < len(nonlab_rooms):
-                                            candidate_room = nonlab_rooms[room_index][0]
-                                            if candidate_room not in used_rooms:
-                                                allocated_room = candidate_room
-                                                course_room_map[course_key] = allocated_room
-                                                basket_used_rooms.setdefault(basket_code, set()).add(allocated_room)
-                                                room_index = (room_index + 1) % len(nonlab_rooms)
-                                                found_room = True
-                                                break
-                                            room_index = (room_index + 1) % len(nonlab_rooms)
-                                        else:
-                                            room_index = 0
-                                    
-                                    # If all rooms are used in this basket, cycle through all available
-                                    if not found_room and nonlab_rooms:
-                                        for i in range(len(nonlab_rooms)):
-                                            idx = (start_index + i) % len(nonlab_rooms)
-                                            candidate_room = nonlab_rooms[idx][0]
-                                            if candidate_room not in used_rooms or len(used_rooms) >= len(nonlab_rooms):
-                                                allocated_room = candidate_room
-                                                course_room_map[course_key] = allocated_room
-                                                basket_used_rooms.setdefault(basket_code, set()).add(allocated_room)
-                                                room_index = (idx + 1) % len(nonlab_rooms)
-                                                break
-                            
-                            # Try to get additional info from main course data if available
-                            dept = ''
-                            ltpsc = ''
-                            credits = ''
-                            
-                            if not course_df.empty and 'Course Code' in course_df.columns:
-                                course_match = course_df[course_df['Course Code'].astype(str) == course_code]
-                                if not course_match.empty:
-                                    match_row = course_match.iloc[0]
-                                    dept = str(match_row.get('Department', '')) if 'Department' in match_row else ''
-                                    ltpsc = str(match_row.get('LTPSC', '')) if 'LTPSC' in match_row else ''
-                                    credits = str(match_row.get('Credits', '')) if 'Credits' in match_row else ''
-                            
-                            basket_assignments = pd.concat([
-                                basket_assignments,
-                                pd.DataFrame([{
-                                    'Basket Code': basket_code,
-                                    'Course Code': course_code,
-                                    'Course Name': course_name,
-                                    'Department': dept,
-                                    'LTPSC': ltpsc,
-                                    'Credits': credits,
-                                    'Instructor': instructor,
-                                    'Classroom Allocated': allocated_room
-                                }])
-                            ], ignore_index=True)
+                    rows = self._build_basket_assignments_from_sheet(sem7_sheet_df, course_df, allocator)
                 else:
                     # No 7th sem sheet found - create empty rows for each basket
-                    if not baskets.empty:
-                        for _, basket_row in baskets.iterrows():
-                            basket_code = str(basket_row.get('Course Code', ''))
-                            course_code = ''  # Empty course code for basket-only rows
-                            
-                            # Allocate classroom for this basket
-                            allocated_room = ''
-                            course_key = (basket_code, course_code)
-                            
-                            if basket_code:
-                                if course_key in course_room_map:
-                                    allocated_room = course_room_map[course_key]
-                                else:
-                                    # Get rooms already used for this basket
-                                    used_rooms = basket_used_rooms.get(basket_code, set())
-                                    
-                                    # Find next available room not used in this basket
-                                    found_room = False
-                                    for _ in range(len(nonlab_rooms)):
-                                        if nonlab_rooms and room_index < len(nonlab_rooms):
-                                            candidate_room = nonlab_rooms[room_index][0]
-                                            if candidate_room not in used_rooms:
-                                                allocated_room = candidate_room
-                                                course_room_map[course_key] = allocated_room
-                                                basket_used_rooms.setdefault(basket_code, set()).add(allocated_room)
-                                                room_index = (room_index + 1) % len(nonlab_rooms)
-                                                found_room = True
-                                                break
-                                            room_index = (room_index + 1) % len(nonlab_rooms)
-                                        else:
-                                            room_index = 0
-                                    
-                                    if not found_room and nonlab_rooms:
-                                        allocated_room = nonlab_rooms[0][0] if nonlab_rooms else ''
-                                        course_room_map[course_key] = allocated_room
-                                        basket_used_rooms.setdefault(basket_code, set()).add(allocated_room)
-                            
-                            basket_assignments = pd.concat([
-                                basket_assignments,
-                                pd.DataFrame([{
-                                    'Basket Code': basket_code,
-                                    'Course Code': '',
-                                    'Course Name': '',
-                                    'Department': '',
-                                    'LTPSC': '',
-                                    'Credits': '',
-                                    'Instructor': '',
-                                    'Classroom Allocated': allocated_room
-                                }])
-                            ], ignore_index=True)
+                    rows = self._build_basket_assignments_fallback(baskets, allocator)
+                basket_rows.extend(rows)
                 
-                total_courses = len(course_room_map)
-                total_rooms_used = len(set(course_room_map.values()))
-                if course_room_map:
+                total_courses = len(allocator.course_room_map)
+                if allocator.course_room_map:
+                    total_rooms_used = len(allocator.unique_allocated_rooms)
                     print(f"    Allocated {total_rooms_used} unique classrooms to {total_courses} courses across baskets")
                 
+                basket_assignments = pd.DataFrame.from_records(basket_rows, columns=basket_columns)
                 basket_assignments.to_excel(w, sheet_name='Basket_Assignments', index=False)
                 
                 # Format basket assignments worksheet
                 try:
                     ws = w.sheets['Basket_Assignments']
-                    self._format_worksheet(ws, has_index=False, start_row=1)
+                    self._format_worksheet(ws, has_index=False, start_row=1, source_df=basket_assignments)
                 except Exception as e:
                     print(f"    WARNING: Could not format Basket_Assignments: {e}")
                 
@@ -9,6 +9,8 @@ class ExcelLoader:
     """Handles loading of Excel files for all data inputs."""
     _department_normalization_map = None
     _two_credit_course_session_map = {}
+    # (course, value) pairs already reported by _coerce_registered_students
+    _reported_registered_students = set()
 
     @staticmethod
     def _get_department_normalization_map():
@@ -350,7 +352,7 @@ class ExcelLoader:
                         df.at[idx, 'Labs_Per_Week'] = 0
             
             print(f"LTPSC parsing completed: {len(df)} courses retained")
-            return df.reset_index(drop=True)
+            return ExcelLoader._coerce_registered_students(df).reset_index(drop=True)
         else:
             # No LTPSC column - assign defaults for all courses
             print("WARNING: LTPSC column not found. Assigning default values based on credits.")
@@ -377,7 +379,29 @@ class ExcelLoader:
                     df.at[idx, 'Tutorials_Per_Week'] = 0
                     df.at[idx, 'Labs_Per_Week'] = 0
             
-            return df.reset_index(drop=True)
+            return ExcelLoader._coerce_registered_students(df).reset_index(drop=True)
+
+    @staticmethod
+    def _coerce_registered_students(df):
+        """Convert the Registered Students column (if any) to int32 in one go.
+        Missing/invalid counts become 0 and the affected courses are listed in a warning."""
+        if 'Registered Students' in df.columns:
+            counts = pd.to_numeric(df['Registered Students'], errors='coerce')
+            counts = counts.where(counts.abs() != math.inf)
+            invalid = counts.isna()
+            if invalid.any():
+                # Courses are re-parsed for every department and session; report each bad value once
+                labels = df['Course Code'] if 'Course Code' in df.columns else pd.Series(df.index, index=df.index)
+                new_rows = [(str(label), str(value))
+                            for label, value in zip(labels[invalid], df.loc[invalid, 'Registered Students'])
+                            if (str(label), str(value)) not in ExcelLoader._reported_registered_students]
+                if new_rows:
+                    ExcelLoader._reported_registered_students.update(new_rows)
+                    print(f"WARNING: {len(new_rows)} courses have missing or invalid Registered Students values; using 0:")
+                    for label, value in new_rows:
+                        print(f"  - {label}: '{value}'")
+            df['Registered Students'] = counts.fillna(0).astype('int32')
+        return df
 
     @staticmethod
     def divide_courses_by_session(courses_df, department, all_sem_courses=None):
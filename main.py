@@ -1,4 +1,5 @@
 """Main execution module for Excel-based timetable generation."""
+import logging
 import os
 import sys
 import pandas as pd
@@ -202,4 +203,13 @@ def main():
         return False
 
 if __name__ == "__main__":
+    # Scheduler status messages are logged: --verbose shows per-course progress (INFO),
+    # --debug adds the per-component DEBUG details
+    if "--debug" in sys.argv[1:]:
+        log_level = logging.DEBUG
+    elif "--verbose" in sys.argv[1:]:
+        log_level = logging.INFO
+    else:
+        log_level = logging.WARNING
+    logging.basicConfig(level=log_level, format="%(levelname)s: %(message)s", stream=sys.stdout)
     main()
\ No newline at end of file
@@ -1,23 +1,170 @@
 """Core scheduling logic for generating timetables from Excel data."""
+import logging
+import numpy as np
 import pandas as pd
 import random
+import sys
+from array import array
+from collections import defaultdict, namedtuple
+from functools import lru_cache
+from operator import itemgetter
 from config import DAYS, TEACHING_SLOTS, LECTURE_DURATION, TUTORIAL_DURATION, LAB_DURATION, MINOR_DURATION
 from config import PRE_MID, POST_MID, MINOR_SUBJECT, MINOR_CLASSES_PER_WEEK, DEPARTMENTS
 from config import MINOR_SLOTS, LUNCH_SLOTS
 from excel_loader import ExcelLoader
 
+logger = logging.getLogger(__name__)
+
+# Room tuples (name, capacity) are ordered by capacity, then name
+_ROOM_SORT_KEY = itemgetter(1, 0)
+
+# One room booking as recorded by ScheduleGenerator._log_room_booking
+Booking = namedtuple('Booking', 'room dept course session')
+
+# LTPSC components scheduled for every course: (LTPSC letter, count name, duration, ScheduleGenerator method)
+SESSION_SPECS = (
+    ('L', 'lectures', LECTURE_DURATION, '_schedule_lectures'),
+    ('T', 'tutorials', TUTORIAL_DURATION, '_schedule_tutorials'),
+    ('P', 'labs', LAB_DURATION, '_schedule_labs'),
+)
+
+# Upper-case markers matched against course codes and names
+_ELEC = 'ELEC'
+_HSS = 'HSS'
+_MINOR_U = MINOR_SUBJECT.upper()
+_MARKERS = (_ELEC, _HSS, _MINOR_U)
+
+# Row/column positions of days and slots in the schedule grid
+_DAY_POS = {d: i for i, d in enumerate(DAYS)}
+_SLOT_POS = {s: i for i, s in enumerate(TEACHING_SLOTS)}
+# End time of each teaching slot in minutes after midnight ('HH:MM-HH:MM' -> HH*60 + MM)
+_SLOT_END_MIN = [hours * 60 + minutes
+                 for hours, minutes in (map(int, s.split('-')[1].split(':')) for s in TEACHING_SLOTS)]
+
+# Teaching slots outside the minor and lunch windows, as an ordered tuple and a set for membership tests
+_NON_REGULAR_SLOTS = frozenset(MINOR_SLOTS) | frozenset(LUNCH_SLOTS)
+REGULAR_SLOTS = tuple(s for s in TEACHING_SLOTS if s not in _NON_REGULAR_SLOTS)
+REGULAR_SLOT_SET = frozenset(REGULAR_SLOTS)
+
+@lru_cache(maxsize=None)
+def _consecutive_slots(start_slot, duration):
+    """Tuple of `duration` teaching slots beginning at start_slot (empty if it runs past the day)."""
+    i = _SLOT_POS.get(start_slot)
+    if i is None or i + duration > len(TEACHING_SLOTS):
+        return ()
+    return tuple(TEACHING_SLOTS[i:i + duration])
+
+@lru_cache(maxsize=None)
+def _slots_mask(slots):
+    """Bitmask over TEACHING_SLOTS positions for a tuple of slots (bit i set = slot i used)."""
+    mask = 0
+    for s in slots:
+        mask |= 1 << _SLOT_POS[s]
+    return mask
+
+def _screen_free(masks, day_idx, busy):
+    """Free flag per combination: its slot mask does not overlap the busy mask of its day."""
+    return (masks & busy[day_idx]) == 0
+
+def _marker_flags(code_u, name_u):
+    """(ELEC, HSS, minor) marker flags per course, as boolean arrays, from upper-cased code and name Series."""
+    # Code and name joined by a newline (which no marker contains), so one scan covers both
+    text = code_u.fillna('').astype(str) + '\n' + name_u.fillna('').astype(str)
+    return tuple(text.str.contains(m, regex=False, na=False).to_numpy(dtype=bool) for m in _MARKERS)
+
+def _no_room_needed(*args, **kwargs):
+    """Stand-in for ScheduleGenerator._assign_room when a session is placed without a room."""
+    return ''
+
+_ALL_DAYS_MASK = (1 << len(DAYS)) - 1
+
+class _DayMask:
+    """Set of days held as a bitmask over DAYS positions (bit i set = DAYS[i] blocked)."""
+    
+    __slots__ = ('bits',)
+    
+    def __init__(self, days=()):
+        self.bits = 0
+        for day in days:
+            self.add(day)
+    
+    def add(self, day):
+        self.bits |= 1 << _DAY_POS[day]
+    
+    def __contains__(self, day):
+        return (self.bits >> _DAY_POS[day]) & 1 == 1
+
+class _ScheduleGrid:
+    """Working schedule for one department/session: a DAYS x TEACHING_SLOTS object array.
+    Plain array indexing keeps the hot availability checks out of pandas' indexer;
+    the grid becomes a DataFrame only when the schedule is handed back.
+    busy[d] mirrors the non-Free cells of day d as a slot bitmask."""
+    
+    __slots__ = ('arr', 'busy')
+    
+    def __init__(self):
+        self.arr = np.full((len(DAYS), len(TEACHING_SLOTS)), 'Free', dtype=object)
+        # Mark lunch break (now possibly multiple 30-min slots)
+        lunch = tuple(s for s in LUNCH_SLOTS if s in _SLOT_POS)
+        for lunch_slot in lunch:
+            self.arr[:, _SLOT_POS[lunch_slot]] = 'LUNCH BREAK'
+        self.busy = [_slots_mask(lunch)] * len(DAYS)
+    
+    def to_dataframe(self):
+        """Return the grid as a Days x Time Slots DataFrame."""
+        return pd.DataFrame(self.arr.copy(), index=DAYS, columns=TEACHING_SLOTS)
+
 class ScheduleGenerator:
     """Generates weekly class schedules for semesters and departments from Excel data."""
     
+    # Departments that may hold the same time slots (same students' courses in both sections)
+    _SHARE_GROUP = {"CSE-A": "CSE", "CSE-B": "CSE"}
+    # Departments that attend combined classes together
+    _COMBINED_GROUP = {"CSE-A": "CSE", "CSE-B": "CSE", "DSAI": "DSAI_ECE", "ECE": "DSAI_ECE"}
+    # Names used in scheduling messages, per component kind
+    _COMPONENT_NAMES = {'Lecture': 'lectures', 'Tutorial': 'tutorials', 'Lab': 'labs'}
+    _ELECTIVE_NAMES = {'Lecture': 'elective classes', 'Tutorial': 'elective tutorials'}
+    _ELECTIVE_SLOT_NAMES = {'Lecture': 'elective', 'Tutorial': 'elective tutorial'}
+    # Accepted course sheet headers per attribute, compared with surrounding whitespace stripped
+    # (ExcelLoader already renames every COMBINED/CLASS header variant to 'Combined Class' at load)
+    _COLUMN_VARIANTS = {
+        'elective': ('Elective (Yes/No)', 'Elective', 'Is Elective', 'Is_Elective'),
+        'combined': ('Combined Class',),
+        'registered': ('Registered Students',),
+    }
+    
     def __init__(self, data_frames):
         """Initialize ScheduleGenerator with data frames."""
         self.dfs = data_frames
         # Track global slots per semester to avoid clashes between departments in same semester
+        # sem_key -> {(department, session): set of (day, slot)}
         self.semester_global_slots = {}
-        # Track room occupancy per (semester, day, slot)
-        self.room_occupancy = {}
-        # Track detailed room bookings per (sem_key, day, slot) for conflict validation
-        self.room_bookings = {}
+        # Busy bitmask per day for each department/session: (sem_key, department, session) -> uint64[len(DAYS)]
+        self.global_busy = defaultdict(lambda: np.zeros(len(DAYS), dtype=np.uint64))
+        # duration -> (preferred_starts, remaining_starts) over REGULAR_SLOTS
+        self._start_cache = {}
+        self._combo_cache = {}
+        # (id(assigned), duration) -> (assigned, slots per day, [(day, slot)]) for elective slot reuse
+        self._elective_plans = {}
+        # tuple(columns) -> {attribute: [actual column names]} for course sheets, see _resolve_columns
+        self._col_aliases = {}
+        # semester_id -> (no courses found, LTPSC-parsed courses); (semester_id, department) -> (pre_mid, post_mid)
+        self._sem_cache = {}
+        self._session_split_cache = {}
+        # NumPy generator for candidate orderings, seeded from `random` so seeded runs stay reproducible
+        self._rng = np.random.default_rng(random.getrandbits(64))
+        # Departments of each combined-class group, in DEPARTMENTS order
+        self._group_depts = {}
+        for dept in DEPARTMENTS:
+            group = self._COMBINED_GROUP.get(dept)
+            if group:
+                self._group_depts.setdefault(group, []).append(dept)
+        # Track room occupancy per (semester, day, slot) as a bitmask over room ids
+        self.room_occupancy_bits = {}
+        # Track detailed room bookings per (sem_key, room, day, slot) for conflict validation
+        self.room_bookings = defaultdict(list)
+        # Keys of room_bookings holding more than one booking, in the order the clash appeared
+        self._room_conflict_keys = []
         # Load classrooms (room_name, capacity) and classify by type
         self.classrooms = []
         self.lab_rooms = []
@@ -44,14 +191,18 @@ class ScheduleGenerator:
                 if name_col is None:
                     name_col = cls_df.columns[0]
                     
-                for _, row in cls_df.iterrows():
-                    room_name = str(row.get(name_col, '')).strip()
-                    try:
-                        capacity = int(float(row.get(cap_col, 0))) if cap_col is not None else 0
-                    except Exception:
-                        capacity = 0
-                    room_type = str(row.get(type_col, '')).strip().lower() if type_col is not None else ''
-                    
+                # Column-wise conversion; bad capacity cells become 0 via to_numeric
+                names = cls_df[name_col].astype(str).str.strip().tolist()
+                if cap_col is not None:
+                    caps = pd.to_numeric(cls_df[cap_col], errors='coerce').fillna(0).astype(int).tolist()
+                else:
+                    caps = [0] * len(names)
+                if type_col is not None:
+                    types = cls_df[type_col].astype(str).str.strip().str.lower().tolist()
+                else:
+                    types = [''] * len(names)
+                
+                for room_name, capacity, room_type in zip(names, caps, types):
                     if room_name:
                         # Special handling for C004 - combined class room only
                         room_name_upper = room_name.upper()
@@ -60,8 +211,6 @@ class ScheduleGenerator:
                             self.shared_rooms.add(room_name_upper)
                             continue
                             
-                        self.classrooms.append((room_name, capacity))
-                        
                         if 'lab' in room_type:
                             self.lab_rooms.append((room_name, capacity))
                             if 'software' in room_type or 'soft' in room_type:
@@ -72,27 +221,35 @@ class ScheduleGenerator:
                             # Normal classrooms (excluding C004)
                             self.nonlab_rooms.append((room_name, capacity))
                 
-                # Sort all room lists by capacity
-                self.classrooms.sort(key=lambda x: (x[1], x[0]))
-                self.lab_rooms.sort(key=lambda x: (x[1], x[0]))
-                self.software_lab_rooms.sort(key=lambda x: (x[1], x[0]))
-                self.hardware_lab_rooms.sort(key=lambda x: (x[1], x[0]))
-                self.nonlab_rooms.sort(key=lambda x: (x[1], x[0]))
+                # Sort all room lists by capacity; every non-C004 room is either a lab or a normal classroom
+                self.lab_rooms.sort(key=_ROOM_SORT_KEY)
+                self.software_lab_rooms.sort(key=_ROOM_SORT_KEY)
+                self.hardware_lab_rooms.sort(key=_ROOM_SORT_KEY)
+                self.nonlab_rooms.sort(key=_ROOM_SORT_KEY)
+                self.classrooms = sorted(self.nonlab_rooms + self.lab_rooms, key=_ROOM_SORT_KEY)
                 
-                print(f"Room configuration loaded:")
-                print(f"  - C004 (Combined): {self.c004_room if self.c004_room else 'Not found'}")
-                print(f"  - Normal classrooms: {len(self.nonlab_rooms)}")
-                print(f"  - Software labs: {len(self.software_lab_rooms)}")
-                print(f"  - Hardware labs: {len(self.hardware_lab_rooms)}")
+                logger.debug("Room configuration loaded:")
+                logger.debug("  - C004 (Combined): %s", self.c004_room if self.c004_room else 'Not found')
+                logger.debug("  - Normal classrooms: %d", len(self.nonlab_rooms))
+                logger.debug("  - Software labs: %d", len(self.software_lab_rooms))
+                logger.debug("  - Hardware labs: %d", len(self.hardware_lab_rooms))
                 
         except Exception as e:
-            print(f"Error loading classroom data: {e}")
+            logger.error("Error loading classroom data: %s", e)
             self.classrooms = []
             self.lab_rooms = []
             self.software_lab_rooms = []
             self.hardware_lab_rooms = []
             self.nonlab_rooms = []
             self.c004_room = None
+        
+        # Stable bit position of every known room (C004 included) for occupancy masks
+        # plus each room's uppercased name, computed once instead of on every assignment
+        self._room_id = {}
+        self._room_upper = {}
+        for name, _ in self.classrooms + ([self.c004_room] if self.c004_room else []):
+            self._room_id.setdefault(name, len(self._room_id))
+            self._room_upper[name] = name.upper()
             
         # Store minor slots per semester
         self.semester_minor_slots = {}
@@ -105,56 +262,39 @@ class ScheduleGenerator:
         self.semester_combined_capacity = {}
         # Combined class assigned slots per course and component:
         # key=(semester_id, course_code, component['Lecture'|'Tutorial'|'Lab']) -> list[(day, slot)]
-        self.semester_combined_course_slots = {}
+        self.semester_combined_course_slots = defaultdict(list)
         # Global combined course slots shared across semesters but per allowed pairing group:
         # key=('GLOBAL', group_key, course_code, component) -> list[(day, start_slot)]
-        self.global_combined_course_slots = {}
-        self.scheduled_slots = {}  # Track all scheduled slots by semester+department
-        self.scheduled_courses = {}  # Track when each course is scheduled
+        self.global_combined_course_slots = defaultdict(list)
+        # Track all scheduled slots per (semester_id, dept, session, course_code) as parallel int8 buffers of
+        # DAYS and TEACHING_SLOTS positions
+        self._scheduled_slot_days = defaultdict(lambda: array('b'))
+        self._scheduled_slot_positions = defaultdict(lambda: array('b'))
+        self.scheduled_courses = defaultdict(int)  # Track when each course is scheduled: days as a bitmask over DAYS positions
         self.actual_allocations = {}  # Track actual allocated counts: key=(semester_id, dept, session, course_code), value={'lectures': X, 'tutorials': Y, 'labs': Z}
-        self.assigned_rooms = {}  # Track room assignments: key=(semester_id, dept, session, course_code) -> room_name
-        self.assigned_lab_rooms = {}  # Track lab room assignments: key=(semester_id, dept, session, course_code) -> room_name
+        self.assigned_rooms = defaultdict(list)  # Track room assignments: key=(semester_id, dept, session, course_code) -> room_name
+        self.assigned_lab_rooms = defaultdict(list)  # Track lab room assignments: key=(semester_id, dept, session, course_code) -> room_name
         
+    def _initialize_grid(self):
+        """Initialize an empty working schedule grid (Free cells, lunch marked)."""
+        return _ScheduleGrid()
+    
     def _initialize_schedule(self):
         """Initialize an empty schedule with Days as rows and Time Slots as columns."""
-        schedule = pd.DataFrame(index=DAYS, columns=TEACHING_SLOTS)
-        
-        # Initialize with 'Free'
-        for day in DAYS:
-            for slot in TEACHING_SLOTS:
-                schedule.loc[day, slot] = 'Free'
-        
-        # Mark lunch break (now possibly multiple 30-min slots)
-        for day in DAYS:
-            for lunch_slot in LUNCH_SLOTS:
-                if lunch_slot in schedule.columns:
-                    schedule.loc[day, lunch_slot] = 'LUNCH BREAK'
-        
-        return schedule
+        return self._initialize_grid().to_dataframe()
     
     def _get_consecutive_slots(self, start_slot, duration):
-        """Get consecutive time slots for a given duration."""
-        try:
-            start_index = TEACHING_SLOTS.index(start_slot)
-            end_index = start_index + duration
-            if end_index <= len(TEACHING_SLOTS):
-                return TEACHING_SLOTS[start_index:end_index]
-        except ValueError:
-            pass
-        return []
+        """Get consecutive time slots for a given duration (internal callers use the cached _consecutive_slots)."""
+        return _consecutive_slots(start_slot, duration)
     
     def _ends_at_thirty(self, slots):
         """Check if a sequence of slots ends at :30."""
         if not slots:
             return False
-        last_slot = slots[-1]
-        # Extract end time from slot (format: 'HH:MM-HH:MM')
-        try:
-            end_time = last_slot.split('-')[1]  # Get the end time
-            # Check if it ends at :30
-            return end_time.endswith(':30')
-        except (IndexError, AttributeError):
+        pos = _SLOT_POS.get(slots[-1])
+        if pos is None:
             return False
+        return _SLOT_END_MIN[pos] % 60 == 30
     
     def _get_preferred_start_slots(self, duration, regular_slots):
         """Get start slots that result in courses ending at :30.
@@ -163,7 +303,7 @@ class ScheduleGenerator:
         remaining = []
         
         for start_slot in regular_slots:
-            slots = self._get_consecutive_slots(start_slot, duration)
+            slots = _consecutive_slots(start_slot, duration)
             # Check all slots are in regular_slots and not in excluded slots
             if len(slots) == duration and all(s in regular_slots for s in slots):
                 if self._ends_at_thirty(slots):
@@ -173,25 +313,89 @@ class ScheduleGenerator:
         
         return preferred, remaining
     
+    def _get_regular_start_slots(self, duration):
+        """Cached _get_preferred_start_slots over REGULAR_SLOTS, keeping only starts whose whole
+        block of duration slots lies within REGULAR_SLOTS."""
+        starts = self._start_cache.get(duration)
+        if starts is None:
+            def fits(start):
+                slots = _consecutive_slots(start, duration)
+                return len(slots) == duration and all(s in REGULAR_SLOT_SET for s in slots)
+            
+            preferred_starts, remaining_starts = self._get_preferred_start_slots(duration, REGULAR_SLOTS)
+            starts = ([s for s in preferred_starts if fits(s)], [s for s in remaining_starts if fits(s)])
+            self._start_cache[duration] = starts
+        return starts
+    
+    def _build_combinations(self, duration):
+        """Cached (combinations, n_preferred, masks, day_idx) for a duration over the regular slots.
+        combinations holds (day, start_slot, slots, mask) tuples; the first n_preferred end at :30.
+        masks/day_idx are NumPy arrays aligned with combinations for vectorized screening."""
+        combos = self._combo_cache.get(duration)
+        if combos is None:
+            preferred_starts, remaining_starts = self._get_regular_start_slots(duration)
+            preferred = []
+            remaining = []
+            for day in DAYS:
+                for start_slot in preferred_starts:
+                    slots = _consecutive_slots(start_slot, duration)
+                    preferred.append((day, start_slot, slots, _slots_mask(slots)))
+                for start_slot in remaining_starts:
+                    slots = _consecutive_slots(start_slot, duration)
+                    remaining.append((day, start_slot, slots, _slots_mask(slots)))
+            combinations = tuple(preferred + remaining)
+            n = len(combinations)
+            masks = np.fromiter((c[3] for c in combinations), dtype=np.uint64, count=n)
+            day_idx = np.fromiter((_DAY_POS[c[0]] for c in combinations), dtype=np.intp, count=n)
+            combos = (combinations, len(preferred), masks, day_idx)
+            self._combo_cache[duration] = combos
+        return combos
+    
+    def _shuffled_order(self, duration):
+        """Random visiting order over the cached combinations: preferred ones first, each group shuffled."""
+        combinations, n_preferred = self._build_combinations(duration)[:2]
+        preferred_order = list(range(n_preferred))
+        remaining_order = list(range(n_preferred, len(combinations)))
+        random.shuffle(preferred_order)
+        random.shuffle(remaining_order)
+        return preferred_order + remaining_order
+    
+    def _busy_by_day(self, schedule, department, session, semester_id):
+        """Local and global busy masks of one department/session combined per day, as a uint64 vector."""
+        busy = schedule.busy
+        if not self._departments_can_share_slots(department, department):
+            day_masks = self.global_busy.get((f"sem_{semester_id}", department, session))
+            if day_masks is not None:
+                return np.array(busy, dtype=np.uint64) | day_masks
+        return np.array(busy, dtype=np.uint64)
+    
+    def _elective_reuse_plan(self, assigned, duration):
+        """Slots per day and the flat (day, slot) list for a shared elective assignment.
+        Cached per assignment list so later electives of the semester only replay it."""
+        key = (id(assigned), duration)
+        plan = self._elective_plans.get(key)
+        if plan is None or plan[0] is not assigned:
+            per_day = {}
+            slot_list = []
+            for day, start in assigned:
+                slots = _consecutive_slots(start, duration)
+                per_day[day] = per_day.get(day, ()) + slots
+                slot_list.extend((day, slot) for slot in slots)
+            # Keep the list itself in the entry so its id cannot be reused while cached
+            plan = (assigned, per_day, slot_list)
+            self._elective_plans[key] = plan
+        return plan[1], plan[2]
+    
     def _get_dept_from_global_key(self, dept_key):
-        """Extract department label from a global slot key (e.g., 'CSE-A' from 'CSE-A_Pre-Mid')."""
-        return dept_key.split('_')[0] if dept_key else ''
+        """Extract department label from a global slot key (e.g., 'CSE-A' from ('CSE-A', 'Pre-Mid'))."""
+        return dept_key[0] if dept_key else ''
 
     def _departments_can_share_slots(self, dept_a, dept_b):
         """Return True if two departments are allowed to share the same time slots."""
-        if not dept_a or not dept_b:
-            return False
+        group_a = self._SHARE_GROUP.get(dept_a)
+        return group_a is not None and group_a == self._SHARE_GROUP.get(dept_b)
 
-        share_groups = [
-            {"CSE-A", "CSE-B"},
-        ]
-
-        for group in share_groups:
-            if dept_a in group and dept_b in group:
-                return True
-        return False
-
-    def _is_time_slot_available_global(self, day, slots, department, session, semester_id):
+    def _is_time_slot_available_global(self, day, slots, department, session, semester_id, mask=None):
         """Enhanced slot availability check to prevent conflicts.
         Rules:
         - Same department + same session = conflict (same students can't be in two classes)
@@ -200,60 +404,46 @@ class ScheduleGenerator:
         - CSE-A and CSE-B can share slots for the same courses."""
         semester_key = f"sem_{semester_id}"
         
-        # Use the same tracking system as _mark_slots_busy_global
-        if semester_key not in self.semester_global_slots:
-            return True  # No slots booked yet for this semester
-        
-        # Check for conflicts
-        for slot in slots:
-            # Check semester-wide conflicts
-            for dept_key, used_slots in self.semester_global_slots[semester_key].items():
-                if (day, slot) in used_slots:
-                    # Extract department from dept_key (format: "DEPT_SESSION")
-                    dept_in_slot = dept_key.split('_')[0] if '_' in dept_key else dept_key
-                    session_in_slot = dept_key.split('_')[1] if '_' in dept_key else ''
-                    
-                    # Allow CSE-A and CSE-B to share slots (they can have same courses at same time)
-                    if self._departments_can_share_slots(department, dept_in_slot):
-                        continue  # Allow sharing between CSE-A and CSE-B
-                    
-                    # Allow same department different sessions (different students)
-                    if department == dept_in_slot and session != session_in_slot:
-                        continue
-                    
-                    # Allow different departments (different students, can share slots)
-                    if department != dept_in_slot:
-                        continue
-                    
-                    # Block: same department + same session = conflict
-                    # (This means department == dept_in_slot and session == session_in_slot)
-                    return False
-        return True
+        # Different departments and different sessions never conflict, and a department in a
+        # sharing group (CSE-A/CSE-B) may share with itself, so only the same (department, session)
+        # busy mask can block
+        if self._departments_can_share_slots(department, department):
+            return True
+        day_masks = self.global_busy.get((semester_key, department, session))
+        if day_masks is None:
+            return True  # Nothing booked yet for this department/session
+        if mask is None:
+            mask = _slots_mask(tuple(slots))
+        return not (day_masks[_DAY_POS[day]] & mask)
 
     def _mark_slots_busy_global(self, day, slots, department, session, semester_id):
         """Mark time slots as busy in global tracker."""
-        key = f"{department}_{session}"
+        key = (department, session)
         semester_key = f"sem_{semester_id}"
         
-        if semester_key not in self.semester_global_slots:
-            self.semester_global_slots[semester_key] = {}
-        
-        if key not in self.semester_global_slots[semester_key]:
-            self.semester_global_slots[semester_key][key] = set()
-        
+        dept_slots = self.semester_global_slots.setdefault(semester_key, {}).setdefault(key, set())
         for slot in slots:
-            self.semester_global_slots[semester_key][key].add((day, slot))
-            # prepare room occupancy tracker
-            occ_key = (semester_key, day, slot)
-            if occ_key not in self.room_occupancy:
-                self.room_occupancy[occ_key] = set()
+            dept_slots.add((day, slot))
+        
+        self.global_busy[(semester_key, department, session)][_DAY_POS[day]] |= _slots_mask(tuple(slots))
     
-    def _is_time_slot_available_local(self, schedule, day, slots):
-        """Check if time slots are available in local schedule."""
-        for slot in slots:
-            if schedule.loc[day, slot] != 'Free':
-                return False
-        return True
+    def _mark_slots_busy_global_bulk(self, semester_key, day, slots, dept_session_pairs):
+        """Mark time slots as busy in the global tracker for several (department, session) pairs at once."""
+        sem_dict = self.semester_global_slots.setdefault(semester_key, {})
+        mask = _slots_mask(tuple(slots))
+        day_pos = _DAY_POS[day]
+        
+        for department, session in dept_session_pairs:
+            dept_slots = sem_dict.setdefault((department, session), set())
+            for slot in slots:
+                dept_slots.add((day, slot))
+            self.global_busy[(semester_key, department, session)][day_pos] |= mask
+    
+    def _is_time_slot_available_local(self, schedule, day, slots, mask=None):
+        """Check if time slots are available in local schedule (mask: precomputed slot bitmask)."""
+        if mask is None:
+            mask = _slots_mask(tuple(slots))
+        return (schedule.busy[_DAY_POS[day]] & mask) == 0
     
     def _mark_slots_busy_local(self, schedule, day, slots, course_code, class_type):
         """Mark time slots as busy in local schedule."""
@@ -265,134 +455,175 @@ class ScheduleGenerator:
         elif class_type == 'Minor':
             suffix = ' (Minor)'
         
+        label = f"{course_code}{suffix}"
+        day_pos = _DAY_POS[day]
+        row = schedule.arr[day_pos]
         for slot in slots:
-            schedule.loc[day, slot] = f"{course_code}{suffix}"
+            row[_SLOT_POS[slot]] = label
+        schedule.busy[day_pos] |= _slots_mask(tuple(slots))
+    
+    def _mark_slots_busy(self, schedule, day, slots, course_code, class_type, department, session, semester_id, scheduled_slots=None):
+        """Mark slots busy in both the local schedule and the global tracker in one call,
+        optionally recording the (day, slot) pairs in scheduled_slots."""
+        self._mark_slots_busy_local(schedule, day, slots, course_code, class_type)
+        self._mark_slots_busy_global(day, slots, department, session, semester_id)
+        if scheduled_slots is not None:
+            scheduled_slots.extend((day, slot) for slot in slots)
     
     def _log_room_booking(self, semester_id, day, slot, room_name, department, course_code, session):
-        """Record a room booking so conflicts can be detected later."""
+        """Record a room booking so conflicts can be detected later (course_code is expected pre-stripped)."""
         semester_key = f"sem_{semester_id}"
-        slot_key = (day, slot)
-        booking = {
-            'room': room_name,
-            'dept': department,
-            'course': str(course_code).strip(),
-            'session': session
-        }
-        if semester_key not in self.room_bookings:
-            self.room_bookings[semester_key] = {}
-        if slot_key not in self.room_bookings[semester_key]:
-            self.room_bookings[semester_key][slot_key] = []
-        self.room_bookings[semester_key][slot_key].append(booking)
+        booking = Booking(room_name, department, course_code, session)
+        key = (semester_key, room_name, day, slot)
+        bookings = self.room_bookings[key]
+        bookings.append(booking)
+        if len(bookings) == 2:
+            # Detected at write time so validation only visits the clashes
+            self._room_conflict_keys.append(key)
+    
+    def _lab_rooms_for(self, department):
+        """Lab rooms a department may use and their kind, returns (rooms, lab_type)."""
+        # CSE and DSAI get software labs
+        if department in ['CSE-A', 'CSE-B', 'CSE', 'DSAI']:
+            return self.software_lab_rooms, "software"
+        # ECE gets hardware labs
+        if department in ['ECE']:
+            return self.hardware_lab_rooms, "hardware"
+        # Default to all labs if department doesn't match
+        return self.lab_rooms, "any"
+    
+    def _has_free_room(self, semester_id, day, slots, rooms):
+        """True if any of rooms is unoccupied for all of the given slots."""
+        semester_key = f"sem_{semester_id}"
+        taken = 0
+        for slot in slots:
+            taken |= self.room_occupancy_bits.get((semester_key, day, slot), 0)
+        room_id = self._room_id
+        return any(not (taken >> room_id[name]) & 1 for name, _ in rooms)
+    
+    def _greedy_order(self, schedule, duration, order, blocked_days, department, session, semester_id, room_pool=None, scored=True):
+        """Yield indices of free combinations for a single pass, in the given (shuffled) order.
+        With scored=True the order is re-ranked best-first: preferred slot (+2), day not yet blocked (+1),
+        a free room of the right kind (+1), and a block that sits against a busy or non-teaching slot so
+        free runs stay whole (+1); the sort is stable, so the shuffle breaks ties.
+        Combinations on days in blocked_days (a _DayMask the caller grows as it places sessions) form a
+        secondary pool, offered only once every day is blocked."""
+        combinations, n_preferred, masks, day_idx = self._build_combinations(duration)
+        busy = self._busy_by_day(schedule, department, session, semester_id)
+        # Busy masks only ever grow, so a combination that is not free now never becomes free
+        free = _screen_free(masks, day_idx, busy)
+        order = [idx for idx in order if free[idx]]
+        
+        if scored:
+            outside = ~_slots_mask(REGULAR_SLOTS)
+            
+            def score(idx):
+                day, _, slots, mask = combinations[idx]
+                value = 2 if idx < n_preferred else 0
+                if day not in blocked_days:
+                    value += 1
+                # Slot masks are contiguous: low is the first slot's bit, mask + low the bit just after the block
+                low = mask & -mask
+                taken = outside | int(busy[_DAY_POS[day]])
+                if ((low >> 1) & taken) or ((mask + low) & taken):
+                    value += 1
+                if room_pool is not None and self._has_free_room(semester_id, day, slots, room_pool):
+                    value += 1
+                return value
+            
+            order.sort(key=score, reverse=True)
+        
+        # Combinations skipped for a blocked day stay live for the fallback; the rest are offered once
+        deferred = []
+        for idx in order:
+            if combinations[idx][0] in blocked_days:
+                deferred.append(idx)
+            else:
+                yield idx
+        if blocked_days.bits == _ALL_DAYS_MASK:
+            # Every day is blocked: fall back to the combinations not offered yet
+            yield from deferred
     
     def _assign_room(self, day, slot, course_code, department, session, semester_id, is_lab=False, is_combined=False, required_capacity=0, slots=None):
         """Assign a room for a course at the specified slots with specific rules."""
         semester_key = f"sem_{semester_id}"
         slot_sequence = slots if slots else [slot]
         
+        occupancy = self.room_occupancy_bits
+        course_code_clean = str(course_code).strip()
+        allocation_key = (semester_id, department, session, course_code)
+        
         def _room_available(room_name):
+            rid = self._room_id[room_name]
             for slot_label in slot_sequence:
-                occ_key = (semester_key, day, slot_label)
-                if occ_key in self.room_occupancy and room_name in self.room_occupancy[occ_key]:
+                if (occupancy.get((semester_key, day, slot_label), 0) >> rid) & 1:
                     return False
             return True
         
         def _mark_room_usage(room_name, target_allocation):
+            room_bit = 1 << self._room_id[room_name]
             for slot_label in slot_sequence:
                 occ_key = (semester_key, day, slot_label)
-                if occ_key not in self.room_occupancy:
-                    self.room_occupancy[occ_key] = set()
-                self.room_occupancy[occ_key].add(room_name)
-                if not room_name or room_name.upper() not in self.shared_rooms:
-                    self._log_room_booking(semester_id, day, slot_label, room_name, department, course_code, session)
+                occupancy[occ_key] = occupancy.get(occ_key, 0) | room_bit
+                if not room_name or self._room_upper[room_name] not in self.shared_rooms:
+                    self._log_room_booking(semester_id, day, slot_label, room_name, department, course_code_clean, session)
             target_allocation.append((day, slot, room_name))
         
+        def _pick_room(rooms, skip_c004=False):
+            # Room lists are kept sorted by (capacity, name), so the first free room that
+            # fits is the smallest fitting one; otherwise fall back to the smallest free room
+            fallback = None
+            for name, cap in rooms:
+                if skip_c004 and self._room_upper[name] == 'C004':
+                    continue
+                if not _room_available(name):
+                    continue
+                if required_capacity <= 0 or cap >= required_capacity:
+                    return name
+                if fallback is None:
+                    fallback = name
+            return fallback
+        
         # RULE 1: Combined classes MUST use C004
         if is_combined:
             if self.c004_room:
                 room_name, room_capacity = self.c004_room
                 # Check capacity
                 if required_capacity > 0 and room_capacity < required_capacity:
-                    print(f"      WARNING: C004 capacity ({room_capacity}) insufficient for combined class {course_code} ({required_capacity} students)")
+                    logger.warning("C004 capacity (%s) insufficient for combined class %s (%s students)",
+                                   room_capacity, course_code, required_capacity)
                     return None
                 
-                allocation_key = (semester_id, department, session, course_code)
-                if allocation_key not in self.assigned_rooms:
-                    self.assigned_rooms[allocation_key] = []
-                
                 _mark_room_usage(room_name, self.assigned_rooms[allocation_key])
                 
-                print(f"      Assigned C004 for combined class {course_code} at {day} {slot}")
+                logger.debug("Assigned C004 for combined class %s at %s %s", course_code, day, slot)
                 return room_name
             else:
-                print(f"      ERROR: C004 not found for combined class {course_code}")
+                logger.error("C004 not found for combined class %s", course_code)
                 return None
         
         # RULE 2: Labs - Department specific assignment
         if is_lab:
-            # CSE and DSAI get software labs
-            if department in ['CSE-A', 'CSE-B', 'CSE', 'DSAI']:
-                available_rooms = self.software_lab_rooms.copy()
-                lab_type = "software"
-            # ECE gets hardware labs
-            elif department in ['ECE']:
-                available_rooms = self.hardware_lab_rooms.copy()
-                lab_type = "hardware"
-            else:
-                # Default to all labs if department doesn't match
-                available_rooms = self.lab_rooms.copy()
-                lab_type = "any"
+            available_rooms, lab_type = self._lab_rooms_for(department)
             
-            # Filter out rooms already occupied at this time
-            filtered_rooms = []
-            for name, cap in available_rooms:
-                if _room_available(name):
-                    filtered_rooms.append((name, cap))
-            available_rooms = filtered_rooms
+            # Smallest free lab that fits (rooms are pre-sorted by capacity)
+            selected_room = _pick_room(available_rooms)
             
-            # Sort by capacity (prefer smallest fitting room)
-            if required_capacity > 0:
-                fitting_rooms = [(name, cap) for name, cap in available_rooms if cap >= required_capacity]
-                if fitting_rooms:
-                    fitting_rooms.sort(key=lambda x: x[1])  # Sort by capacity ascending
-                    available_rooms = fitting_rooms
-            
-            # Select room (prefer smaller rooms for better utilization)
-            if available_rooms:
-                available_rooms.sort(key=lambda x: x[1])
-                selected_room = available_rooms[0][0]
-                
+            if selected_room:
                 # Mark room as occupied
-                allocation_key = (semester_id, department, session, course_code)
-                if allocation_key not in self.assigned_lab_rooms:
-                    self.assigned_lab_rooms[allocation_key] = []
-                
                 _mark_room_usage(selected_room, self.assigned_lab_rooms[allocation_key])
                 
-                print(f"      Assigned {lab_type} lab {selected_room} for {course_code} at {day} {slot}")
+                logger.debug("Assigned %s lab %s for %s at %s %s", lab_type, selected_room, course_code, day, slot)
                 return selected_room
             else:
-                print(f"      WARNING: No {lab_type} lab available for {course_code} at {day} {slot}")
+                logger.warning("No %s lab available for %s at %s %s", lab_type, course_code, day, slot)
                 return None
         
         # RULE 3: Regular classes - Use normal classrooms (NOT C004)
-        available_rooms = [(name, cap) for name, cap in self.nonlab_rooms.copy() if name.upper() != 'C004']
-        available_rooms = [(name, cap) for name, cap in available_rooms if _room_available(name)]
-        
-        # Sort by capacity (prefer smallest fitting room)
-        if required_capacity > 0:
-            fitting_rooms = [(name, cap) for name, cap in available_rooms if cap >= required_capacity]
-            if fitting_rooms:
-                fitting_rooms.sort(key=lambda x: x[1])  # Sort by capacity ascending
-                available_rooms = fitting_rooms
-        
-        # Select room (prefer smaller rooms for better utilization)
-        if available_rooms:
-            available_rooms.sort(key=lambda x: x[1])
-            selected_room = available_rooms[0][0]
-            
-            allocation_key = (semester_id, department, session, course_code)
-            if allocation_key not in self.assigned_rooms:
-                self.assigned_rooms[allocation_key] = []
+        # Smallest free classroom that fits (rooms are pre-sorted by capacity)
+        selected_room = _pick_room(self.nonlab_rooms, skip_c004=True)
+        
+        if selected_room:
             _mark_room_usage(selected_room, self.assigned_rooms[allocation_key])
             
             return selected_room
@@ -406,13 +637,11 @@ class ScheduleGenerator:
         if int(semester_id) == 1:
             return
         scheduled = 0
-        attempts = 0
-        max_attempts = 200
         
         # Compute valid minor start slots (so MINOR_DURATION consecutive slots are within MINOR_SLOTS)
         minor_starts = []
         for s in MINOR_SLOTS:
-            seq = self._get_consecutive_slots(s, MINOR_DURATION)
+            seq = _consecutive_slots(s, MINOR_DURATION)
             if len(seq) == MINOR_DURATION and all(x in MINOR_SLOTS for x in seq):
                 minor_starts.append(s)
         
@@ -425,25 +654,24 @@ class ScheduleGenerator:
         if semester_key in self.semester_minor_slots:
             assigned = self.semester_minor_slots[semester_key]
             for day, start in assigned:
-                slots = self._get_consecutive_slots(start, MINOR_DURATION)
-                self._mark_slots_busy_local(schedule, day, slots, MINOR_SUBJECT, 'Minor')
-                self._mark_slots_busy_global(day, slots, department, session, semester_id)
+                slots = _consecutive_slots(start, MINOR_DURATION)
+                self._mark_slots_busy(schedule, day, slots, MINOR_SUBJECT, 'Minor', department, session, semester_id)
             return
 
         assigned = []
-        while scheduled < MINOR_CLASSES_PER_WEEK and attempts < max_attempts:
-            attempts += 1
-            
-            day = random.choice(DAYS)
-            start = random.choice(minor_starts)
-            slots = self._get_consecutive_slots(start, MINOR_DURATION)
+        # Visit every (day, start) candidate at most once, in random order
+        candidates = [(d, st) for d in DAYS for st in minor_starts]
+        random.shuffle(candidates)
+        for day, start in candidates:
+            if scheduled >= MINOR_CLASSES_PER_WEEK:
+                break
+            slots = _consecutive_slots(start, MINOR_DURATION)
             
             if (len(slots) == MINOR_DURATION and
                 self._is_time_slot_available_local(schedule, day, slots) and
                 self._is_time_slot_available_global(day, slots, department, session, semester_id)):
                 
-                self._mark_slots_busy_local(schedule, day, slots, MINOR_SUBJECT, 'Minor')
-                self._mark_slots_busy_global(day, slots, department, session, semester_id)
+                self._mark_slots_busy(schedule, day, slots, MINOR_SUBJECT, 'Minor', department, session, semester_id)
                 
                 assigned.append((day, start))
                 scheduled += 1
@@ -451,63 +679,56 @@ class ScheduleGenerator:
         if assigned:
             self.semester_minor_slots[semester_key] = assigned
 
-    def _find_combined_slots(self, schedule, component, duration, department, session, semester_id, avoid_days=None):
+    def _find_combined_slots(self, schedule, component, duration, department, session, semester_id, avoid_days=None, exclude=()):
         """Find available slots for combined classes across all departments in the same group.
+        (day, start_slot) pairs in exclude are not considered.
         Returns list of (day, start_slot) tuples for combined scheduling."""
         combined_slots = []
-        attempts = 0
-        max_attempts = 500
         avoid_days = set(avoid_days or [])
-        regular_slots = [slot for slot in TEACHING_SLOTS if slot not in (MINOR_SLOTS + LUNCH_SLOTS)]
         
-        # Get preferred start slots (ending at :30) and remaining slots
-        preferred_starts, remaining_starts = self._get_preferred_start_slots(duration, regular_slots)
+        # Get preferred start slots (ending at :30) and remaining slots, all fully within the regular slots
+        preferred_starts, remaining_starts = self._get_regular_start_slots(duration)
         
         # Combine: preferred first, then remaining
         all_possible_starts = preferred_starts + remaining_starts
         
         # Determine which departments can share combined slots
-        def _get_combined_group(dept_label):
-            if dept_label in {'CSE-A', 'CSE-B'}:
-                return 'CSE'
-            if dept_label in {'DSAI', 'ECE'}:
-                return 'DSAI_ECE'
-            return None
-        
-        group_key = _get_combined_group(department)
+        group_key = self._COMBINED_GROUP.get(department)
         if not group_key:
             return combined_slots
         
-        while attempts < max_attempts:
-            attempts += 1
-            day = random.choice([d for d in DAYS if d not in avoid_days])
-            if not all_possible_starts:
-                break
-            start_slot = random.choice(all_possible_starts)
-            slots = self._get_consecutive_slots(start_slot, duration)
-            slots = [slot for slot in slots if slot in regular_slots]
+        # Visit every (day, start) candidate at most once, in random order
+        candidates = [(d, st) for d in DAYS if d not in avoid_days for st in all_possible_starts
+                      if (d, st) not in exclude]
+        for idx in self._rng.permutation(len(candidates)):
+            day, start_slot = candidates[idx]
+            slots = _consecutive_slots(start_slot, duration)
+            mask = _slots_mask(slots)
             
-            if len(slots) == duration:
-                # Check if slots are available for ALL departments in the group
-                all_available = True
-                for dept in DEPARTMENTS:
-                    if _get_combined_group(dept) == group_key:
-                        # Check local availability for each department
-                        dept_schedule = schedule  # We're working with current department's schedule
-                        if not self._is_time_slot_available_local(dept_schedule, day, slots):
-                            all_available = False
-                            break
-                        # Check global availability
-                        if not self._is_time_slot_available_global(day, slots, dept, session, semester_id):
-                            all_available = False
-                            break
-                
-                if all_available:
-                    combined_slots.append((day, start_slot))
-                    break
+            # Local availability only depends on the current department's schedule, so test it once
+            if not self._is_time_slot_available_local(schedule, day, slots, mask):
+                continue
+            
+            # Check global availability for ALL departments in the group
+            all_available = all(self._is_time_slot_available_global(day, slots, dept, session, semester_id, mask)
+                                for dept in self._group_depts.get(group_key, []))
+            
+            if all_available:
+                combined_slots.append((day, start_slot))
+                break
         
         return combined_slots
 
+    def _apply_combined_assignment(self, schedule, day, start, duration, course_code, component, department, session, semester_id, is_lab, required_capacity):
+        """Book an already agreed combined slot for one department and assign C004, returns (slots, room)."""
+        slots = _consecutive_slots(start, duration)
+        self._mark_slots_busy(schedule, day, slots, course_code, component, department, session, semester_id)
+        
+        # Assign C004 for this combined class
+        room = self._assign_room(day, start, course_code, department, session, semester_id,
+                                 is_lab=is_lab, is_combined=True, required_capacity=required_capacity, slots=slots)
+        return slots, room
+    
     def _schedule_combined_class(self, schedule, course_code, component, duration, required_count, department, session, semester_id, avoid_days=None, required_capacity=0):
         """Schedule combined class for all departments in the same group with C004 room allocation."""
         scheduled_count = 0
@@ -515,69 +736,41 @@ class ScheduleGenerator:
         assigned_rooms = []
         
         # Check if combined slots already exist for this course
-        def _get_combined_group(dept_label):
-            if dept_label in {'CSE-A', 'CSE-B'}:
-                return 'CSE'
-            if dept_label in {'DSAI', 'ECE'}:
-                return 'DSAI_ECE'
-            return None
-        
-        group_key = _get_combined_group(department)
+        group_key = self._COMBINED_GROUP.get(department)
         course_key = str(course_code).strip()
         is_lab = (component == 'Lab')
         
-        # Check global combined slots first
+        # Reuse existing combined slots: global group slots first, then semester-specific ones
         if group_key:
-            global_key = ('GLOBAL', group_key, course_key, component)
-            assigned = self.global_combined_course_slots.get(global_key, [])
-            
-            if assigned and len(assigned) >= required_count:
-                # Use existing global slots
-                for day, start in assigned[:required_count]:
-                    slots = self._get_consecutive_slots(start, duration)
-                    self._mark_slots_busy_local(schedule, day, slots, course_code, component)
-                    self._mark_slots_busy_global(day, slots, department, session, semester_id)
-                    scheduled_slots.extend([(day, slot) for slot in slots])
-                    
-                    # Assign C004 for this combined class
-                    room = self._assign_room(day, start, course_code, department, session, semester_id, 
-                                          is_lab=is_lab, is_combined=True, required_capacity=required_capacity, slots=slots)
-                    if room:
-                        assigned_rooms.append(room)
-                    
-                    scheduled_count += 1
-                return scheduled_count, scheduled_slots, assigned_rooms
-            
-            # Check semester-specific combined slots
-            sem_key = (semester_id, course_key, component)
-            assigned = self.semester_combined_course_slots.get(sem_key, [])
-            
-            if assigned and len(assigned) >= required_count:
-                # Use existing semester slots
+            existing_keys = (
+                (self.global_combined_course_slots, ('GLOBAL', group_key, course_key, component)),
+                (self.semester_combined_course_slots, (semester_id, course_key, component)),
+            )
+            for slot_store, store_key in existing_keys:
+                assigned = slot_store.get(store_key, [])
+                if not assigned or len(assigned) < required_count:
+                    continue
+                
                 for day, start in assigned[:required_count]:
-                    slots = self._get_consecutive_slots(start, duration)
-                    self._mark_slots_busy_local(schedule, day, slots, course_code, component)
-                    self._mark_slots_busy_global(day, slots, department, session, semester_id)
-                    scheduled_slots.extend([(day, slot) for slot in slots])
-                    
-                    # Assign C004 for this combined class
-                    room = self._assign_room(day, start, course_code, department, session, semester_id, 
-                                          is_lab=is_lab, is_combined=True, required_capacity=required_capacity, slots=slots)
+                    slots, room = self._apply_combined_assignment(
+                        schedule, day, start, duration, course_code, component, department,
+                        session, semester_id, is_lab, required_capacity)
+                    scheduled_slots.extend((day, slot) for slot in slots)
                     if room:
                         assigned_rooms.append(room)
-                    
                     scheduled_count += 1
                 return scheduled_count, scheduled_slots, assigned_rooms
         
-        # Find new combined slots
+        # Find new combined slots; pairs where C004 was taken are not offered again
+        tried = set()
         while scheduled_count < required_count:
-            combined_slots = self._find_combined_slots(schedule, component, duration, department, session, semester_id, avoid_days)
+            combined_slots = self._find_combined_slots(schedule, component, duration, department, session, semester_id, avoid_days, tried)
             
             if not combined_slots:
                 break
             
             day, start_slot = combined_slots[0]
-            slots = self._get_consecutive_slots(start_slot, duration)
+            slots = _consecutive_slots(start_slot, duration)
             
             # Assign C004 first (before marking slots globally)
             room = self._assign_room(day, start_slot, course_code, department, session, semester_id, 
@@ -585,44 +778,121 @@ class ScheduleGenerator:
             
             if room:  # C004 must be available for combined classes
                 # Mark slots for all departments in group
-                for dept in DEPARTMENTS:
-                    if _get_combined_group(dept) == group_key:
-                        self._mark_slots_busy_global(day, slots, dept, session, semester_id)
+                group_pairs = [(dept, session) for dept in self._group_depts.get(group_key, [])]
+                self._mark_slots_busy_global_bulk(f"sem_{semester_id}", day, slots, group_pairs)
                 
                 # Mark locally for current department
                 self._mark_slots_busy_local(schedule, day, slots, course_code, component)
-                scheduled_slots.extend([(day, slot) for slot in slots])
+                scheduled_slots.extend((day, slot) for slot in slots)
                 scheduled_count += 1
                 assigned_rooms.append(room)
                 
                 # Store combined slot
                 if group_key:
-                    global_key = ('GLOBAL', group_key, course_key, component)
-                    if global_key not in self.global_combined_course_slots:
-                        self.global_combined_course_slots[global_key] = []
-                    self.global_combined_course_slots[global_key].append((day, start_slot))
-                    
-                    sem_key = (semester_id, course_key, component)
-                    if sem_key not in self.semester_combined_course_slots:
-                        self.semester_combined_course_slots[sem_key] = []
-                    self.semester_combined_course_slots[sem_key].append((day, start_slot))
+                    self.global_combined_course_slots[('GLOBAL', group_key, course_key, component)].append((day, start_slot))
+                    self.semester_combined_course_slots[(semester_id, course_key, component)].append((day, start_slot))
             else:
                 # C004 not available, try different slot
-                continue
+                tried.add((day, start_slot))
         
         return scheduled_count, scheduled_slots, assigned_rooms
 
+    def _schedule_component(self, schedule, course_code, duration, kind, sessions_per_week, department, session, semester_id,
+                            avoid_days=None, shared_slot_cache_key=None, skip_room=False, required_capacity=0, placed_slots=None):
+        """Place sessions_per_week sessions of one component (kind: 'Lecture', 'Tutorial' or 'Lab') in a single pass.
+        Regular components visit combinations best-scored first and get a room unless skip_room is set.
+        Shared electives pass shared_slot_cache_key = (slot_store, common_key, course_key): slots already
+        stored there are reused, otherwise a shuffled pass picks them and they are stored for the semester.
+        placed_slots are (day, slot) tuples already booked for this component (e.g. a partial combined
+        assignment): they count towards sessions_per_week and their days are avoided.
+        Returns list of (day, slot) tuples."""
+        scheduled_slots = list(placed_slots or [])
+        attempts = 0
+        avoid_days = set(avoid_days or [])
+        avoid_days.update(day for day, _ in scheduled_slots)
+        
+        if shared_slot_cache_key is not None:
+            slot_store, common_key, course_key = shared_slot_cache_key
+            slot_label = self._ELECTIVE_SLOT_NAMES[kind]
+            # If common slots have been assigned for this semester, ALL electives must use them;
+            # otherwise fall back to slots this specific course got earlier (legacy course-specific keys)
+            assigned = slot_store.get(common_key)
+            if assigned is not None:
+                logger.debug("Using common %s slots for %s (already assigned for semester %s)", slot_label, course_code, semester_id)
+                # Also store under course-specific key for backward compatibility
+                slot_store[course_key] = assigned
+            else:
+                assigned = slot_store.get(course_key)
+                if assigned is not None:
+                    # Promote to common slots so all future electives use the same slots
+                    slot_store[common_key] = assigned
+                    logger.debug("Using existing %s slots for %s (promoted to common slots for semester %s)",
+                                 slot_label, course_code, semester_id)
+            
+            if assigned is not None:
+                per_day, slot_list = self._elective_reuse_plan(assigned, duration)
+                for day, slots in per_day.items():
+                    if day in avoid_days:
+                        continue
+                    self._mark_slots_busy(schedule, day, slots, course_code, kind, department, session, semester_id)
+                scheduled_slots.extend(entry for entry in slot_list if entry[0] not in avoid_days)
+                return scheduled_slots
+        
+        # Cached (day, start_slot, slots, mask) combinations, visited once in shuffled order;
+        # regular components re-rank it best-scored first, shared electives keep it as is
+        all_combinations = self._build_combinations(duration)[0]
+        order = self._shuffled_order(duration)
+        is_lab = (kind == 'Lab')
+        room_pool = None
+        if not skip_room:
+            room_pool = self._lab_rooms_for(department)[0] if is_lab else self.nonlab_rooms
+        # Resolved once: electives and minors are placed without a room
+        assign_room = _no_room_needed if skip_room else self._assign_room
+        blocked_days = _DayMask(avoid_days)
+        candidates = self._greedy_order(schedule, duration, order, blocked_days, department, session, semester_id,
+                                        room_pool, scored=shared_slot_cache_key is None)
+        
+        assigned = []
+        for combo_idx in candidates:
+            if len(scheduled_slots) >= sessions_per_week * duration:
+                break
+            attempts += 1
+            day, start_slot, slots, mask = all_combinations[combo_idx]
+            
+            # An earlier placement in this pass may have taken these slots
+            if not (self._is_time_slot_available_local(schedule, day, slots, mask) and
+                    self._is_time_slot_available_global(day, slots, department, session, semester_id, mask)):
+                continue
+            
+            room = assign_room(day, start_slot, course_code, department, session, semester_id,
+                               is_lab=is_lab, is_combined=False, required_capacity=required_capacity, slots=slots)
+            if room is None:
+                continue  # No room for this combination; try the next one
+            
+            self._mark_slots_busy(schedule, day, slots, course_code, kind, department, session, semester_id, scheduled_slots)
+            assigned.append((day, start_slot))
+            blocked_days.add(day)
+        
+        if shared_slot_cache_key is not None and assigned:
+            # Store under common key so ALL electives in this semester use the same slots
+            slot_store[common_key] = assigned
+            # Also store under course-specific key for backward compatibility
+            slot_store[course_key] = assigned
+            logger.debug("Assigned common %s slots for semester %s: %s", slot_label, semester_id, assigned)
+        
+        scheduled_count = len(scheduled_slots) // duration
+        if scheduled_count < sessions_per_week:
+            names = self._ELECTIVE_NAMES if shared_slot_cache_key is not None else self._COMPONENT_NAMES
+            logger.warning("%s - Only scheduled %d/%d %s (attempts: %d)",
+                           course_code, scheduled_count, sessions_per_week, names[kind], attempts)
+        return scheduled_slots
+
     def _schedule_lectures(self, schedule, course_code, lectures_per_week, department, session, semester_id, avoid_days=None, is_combined=False, is_elective=False, is_minor=False, required_capacity=0):
         """Schedule lecture sessions with room allocation, returns list of (day, slot) tuples.
         Prioritizes slots ending at :30, falls back to remaining slots if needed."""
         if lectures_per_week == 0:
             return []
-        scheduled_slots = []
-        attempts = 0
-        max_attempts = 2000  # Increased attempts for better allocation
-        used_days = set()
         avoid_days = set(avoid_days or [])
-        regular_slots = [slot for slot in TEACHING_SLOTS if slot not in (MINOR_SLOTS + LUNCH_SLOTS)]
 
         # PRIORITY 1: Handle combined classes first
         if is_combined:
@@ -632,7 +902,7 @@ class ScheduleGenerator:
             )
             if scheduled_count >= lectures_per_week:
                 return combined_slots
-            # If not all combined slots found, continue with regular scheduling for remaining
+            # If not all combined slots found, regular scheduling only places the remainder
         
         # PRIORITY 2: Handle electives with common slots
         if is_elective:
@@ -640,74 +910,11 @@ class ScheduleGenerator:
             if elective_slots:
                 return elective_slots
         
-        skip_room_assignment = is_elective or is_minor
-
         # PRIORITY 3: Regular lecture scheduling
-        # Get preferred start slots (ending at :30) and remaining slots
-        preferred_starts, remaining_starts = self._get_preferred_start_slots(LECTURE_DURATION, regular_slots)
-        
-        # Build list of all possible (day, start_slot) combinations, prioritizing preferred slots
-        preferred_combinations = []
-        remaining_combinations = []
-        for day in DAYS:
-            for start_slot in preferred_starts:
-                slots = self._get_consecutive_slots(start_slot, LECTURE_DURATION)
-                slots = [slot for slot in slots if slot in regular_slots]
-                if len(slots) == LECTURE_DURATION:
-                    preferred_combinations.append((day, start_slot, slots))
-            for start_slot in remaining_starts:
-                slots = self._get_consecutive_slots(start_slot, LECTURE_DURATION)
-                slots = [slot for slot in slots if slot in regular_slots]
-                if len(slots) == LECTURE_DURATION:
-                    remaining_combinations.append((day, start_slot, slots))
-        
-        # Shuffle both lists for randomness
-        random.shuffle(preferred_combinations)
-        random.shuffle(remaining_combinations)
-        
-        # Combine: preferred first, then remaining
-        all_combinations = preferred_combinations + remaining_combinations
-
-        while len(scheduled_slots) < lectures_per_week * LECTURE_DURATION and attempts < max_attempts:
-            attempts += 1
-            
-            # Try to use days where this course isn't already scheduled
-            available_combos = [combo for combo in all_combinations if combo[0] not in used_days and combo[0] not in avoid_days]
-            if not available_combos:
-                available_combos = all_combinations
-            
-            if not available_combos:
-                break
-            
-            day, start_slot, slots = random.choice(available_combos)
-            
-            # Check all slots are available (both local and global)
-            slots_available = True
-            for slot in slots:
-                if not (self._is_time_slot_available_local(schedule, day, [slot]) and
-                       self._is_time_slot_available_global(day, [slot], department, session, semester_id)):
-                    slots_available = False
-                    break
-            
-            if slots_available:
-                room_available = True
-                if not skip_room_assignment:
-                    room = self._assign_room(day, start_slot, course_code, department, session, semester_id, 
-                                             is_lab=False, is_combined=False, required_capacity=required_capacity, slots=slots)
-                    room_available = room is not None
-                if room_available:
-                    for slot in slots:
-                        self._mark_slots_busy_local(schedule, day, [slot], course_code, 'Lecture')
-                        self._mark_slots_busy_global(day, [slot], department, session, semester_id)
-                        scheduled_slots.append((day, slot))
-                    used_days.add(day)
-                    avoid_days.add(day)
-                    all_combinations = [c for c in all_combinations if c != (day, start_slot, slots)]
-
-        scheduled_count = len(scheduled_slots) // LECTURE_DURATION
-        if scheduled_count < lectures_per_week:
-            print(f"      WARNING: {course_code} - Only scheduled {scheduled_count}/{lectures_per_week} lectures (attempts: {attempts})")
-        return scheduled_slots
+        return self._schedule_component(schedule, course_code, LECTURE_DURATION, 'Lecture', lectures_per_week,
+                                        department, session, semester_id, avoid_days,
+                                        skip_room=is_elective or is_minor, required_capacity=required_capacity,
+                                        placed_slots=combined_slots if is_combined else None)
 
     def _schedule_elective_classes(self, schedule, course_code, elective_per_week, department, session, semester_id, avoid_days=None, required_capacity=0):
         """Schedule elective classes at the same slot/day for all departments/sections in a semester.
@@ -715,117 +922,16 @@ class ScheduleGenerator:
         Returns list of (day, slot) tuples."""
         if elective_per_week == 0:
             return []
-        scheduled_slots = []
-        attempts = 0
-        max_attempts = 1000  # Increased for better success rate
         semester_key = f"sem_{semester_id}"
-        avoid_days = set(avoid_days or [])
         
         # Use a common key for ALL electives in a semester to ensure same time slots
         # This ensures CSE, DSAI, and ECE all have electives at the same time
         common_elective_key = (semester_key, 'ALL_ELECTIVES')
         elective_key = (semester_key, course_code)
-        used_days = set()
-        regular_slots = [slot for slot in TEACHING_SLOTS if slot not in (MINOR_SLOTS + LUNCH_SLOTS)]
-        
-        # First, check if common elective slots have been assigned for this semester
-        # If yes, ALL electives must use those same slots
-        if common_elective_key in self.semester_elective_slots:
-            assigned = self.semester_elective_slots[common_elective_key]
-            print(f"      Using common elective slots for {course_code} (already assigned for semester {semester_id})")
-            for day, start in assigned:
-                slots = self._get_consecutive_slots(start, LECTURE_DURATION)
-                if day in avoid_days:
-                    continue
-                for slot in slots:
-                    self._mark_slots_busy_local(schedule, day, [slot], course_code, 'Lecture')
-                    self._mark_slots_busy_global(day, [slot], department, session, semester_id)
-                    scheduled_slots.append((day, slot))
-            # Also store under course-specific key for backward compatibility
-            self.semester_elective_slots[elective_key] = assigned
-            return scheduled_slots
-        
-        # If no common slots assigned yet, check if this specific course has slots assigned
-        # (This handles legacy cases where course-specific slots were assigned first)
-        if elective_key in self.semester_elective_slots:
-            assigned = self.semester_elective_slots[elective_key]
-            # Promote to common slots so all future electives use the same slots
-            self.semester_elective_slots[common_elective_key] = assigned
-            print(f"      Using existing elective slots for {course_code} (promoted to common slots for semester {semester_id})")
-            for day, start in assigned:
-                slots = self._get_consecutive_slots(start, LECTURE_DURATION)
-                if day in avoid_days:
-                    continue
-                for slot in slots:
-                    self._mark_slots_busy_local(schedule, day, [slot], course_code, 'Lecture')
-                    self._mark_slots_busy_global(day, [slot], department, session, semester_id)
-                    scheduled_slots.append((day, slot))
-            return scheduled_slots
-
-        # Get preferred start slots (ending at :30) and remaining slots
-        preferred_starts, remaining_starts = self._get_preferred_start_slots(LECTURE_DURATION, regular_slots)
-        
-        # Build list of all possible (day, start_slot) combinations, prioritizing preferred slots
-        preferred_combinations = []
-        remaining_combinations = []
-        for day in DAYS:
-            for start_slot in preferred_starts:
-                slots = self._get_consecutive_slots(start_slot, LECTURE_DURATION)
-                slots = [slot for slot in slots if slot in regular_slots]
-                if len(slots) == LECTURE_DURATION:
-                    preferred_combinations.append((day, start_slot, slots))
-            for start_slot in remaining_starts:
-                slots = self._get_consecutive_slots(start_slot, LECTURE_DURATION)
-                slots = [slot for slot in slots if slot in regular_slots]
-                if len(slots) == LECTURE_DURATION:
-                    remaining_combinations.append((day, start_slot, slots))
-        
-        # Shuffle both lists for randomness
-        random.shuffle(preferred_combinations)
-        random.shuffle(remaining_combinations)
-        
-        # Combine: preferred first, then remaining
-        all_combinations = preferred_combinations + remaining_combinations
-
-        assigned = []
-        scheduled = 0
-        while scheduled < elective_per_week and attempts < max_attempts:
-            attempts += 1
-            available_combos = [combo for combo in all_combinations if combo[0] not in used_days and combo[0] not in avoid_days]
-            if not available_combos:
-                available_combos = all_combinations
-            if not available_combos:
-                break
-            
-            day, start_slot, slots = random.choice(available_combos) if available_combos else (None, None, None)
-            if day is None:
-                break
-            
-            if (self._is_time_slot_available_local(schedule, day, slots) and
-                self._is_time_slot_available_global(day, slots, department, session, semester_id)):
-                
-                for slot in slots:
-                    self._mark_slots_busy_local(schedule, day, [slot], course_code, 'Lecture')
-                    self._mark_slots_busy_global(day, [slot], department, session, semester_id)
-                    scheduled_slots.append((day, slot))
-                assigned.append((day, start_slot))
-                used_days.add(day)
-                avoid_days.add(day)
-                scheduled += 1
-                # Remove this combination from future consideration
-                all_combinations = [c for c in all_combinations if c != (day, start_slot, slots)]
-        
-        if assigned:
-            # Store under common key so ALL electives in this semester use the same slots
-            self.semester_elective_slots[common_elective_key] = assigned
-            # Also store under course-specific key for backward compatibility
-            self.semester_elective_slots[elective_key] = assigned
-            print(f"      Assigned common elective slots for semester {semester_id}: {assigned}")
-        
-        scheduled_count = len(scheduled_slots) // LECTURE_DURATION
-        if scheduled_count < elective_per_week:
-            print(f"      WARNING: {course_code} - Only scheduled {scheduled_count}/{elective_per_week} elective classes (attempts: {attempts})")
-        return scheduled_slots
+        shared = (self.semester_elective_slots, common_elective_key, elective_key)
+        return self._schedule_component(schedule, course_code, LECTURE_DURATION, 'Lecture', elective_per_week,
+                                        department, session, semester_id, avoid_days,
+                                        shared_slot_cache_key=shared, skip_room=True, required_capacity=required_capacity)
 
     def _schedule_elective_tutorials(self, schedule, course_code, elective_tutorials_per_week, department, session, semester_id, avoid_days=None, required_capacity=0):
         """Schedule elective tutorials at the same slot/day for all departments/sections in a semester.
@@ -834,132 +940,24 @@ class ScheduleGenerator:
         Returns list of (day, slot) tuples."""
         if elective_tutorials_per_week == 0:
             return []
-        scheduled_slots = []
-        attempts = 0
-        max_attempts = 1000
         semester_key = f"sem_{semester_id}"
-        avoid_days = set(avoid_days or [])
         
         # Use a common key for ALL elective tutorials in a semester to ensure same time slots
         # This ensures CSE-A, CSE-B, DSAI, and ECE all have elective tutorials at the same time
         # Works for both Pre-Mid and Post-Mid sessions
         common_elective_tutorial_key = (semester_key, 'ALL_ELECTIVE_TUTORIALS')
         elective_tutorial_key = (semester_key, course_code, 'Tutorial')
-        used_days = set()
-        regular_slots = [slot for slot in TEACHING_SLOTS if slot not in (MINOR_SLOTS + LUNCH_SLOTS)]
-        
-        # First, check if common elective tutorial slots have been assigned for this semester
-        # If yes, ALL elective tutorials must use those same slots (for both Pre-Mid and Post-Mid)
-        if common_elective_tutorial_key in self.semester_elective_tutorial_slots:
-            assigned = self.semester_elective_tutorial_slots[common_elective_tutorial_key]
-            print(f"      Using common elective tutorial slots for {course_code} (already assigned for semester {semester_id})")
-            for day, start in assigned:
-                slots = self._get_consecutive_slots(start, TUTORIAL_DURATION)
-                if day in avoid_days:
-                    continue
-                for slot in slots:
-                    self._mark_slots_busy_local(schedule, day, [slot], course_code, 'Tutorial')
-                    self._mark_slots_busy_global(day, [slot], department, session, semester_id)
-                    scheduled_slots.append((day, slot))
-            # Also store under course-specific key for backward compatibility
-            self.semester_elective_tutorial_slots[elective_tutorial_key] = assigned
-            return scheduled_slots
-        
-        # If no common slots assigned yet, check if this specific course has tutorial slots assigned
-        # (This handles legacy cases where course-specific slots were assigned first)
-        if elective_tutorial_key in self.semester_elective_tutorial_slots:
-            assigned = self.semester_elective_tutorial_slots[elective_tutorial_key]
-            # Promote to common slots so all future elective tutorials use the same slots
-            self.semester_elective_tutorial_slots[common_elective_tutorial_key] = assigned
-            print(f"      Using existing elective tutorial slots for {course_code} (promoted to common slots for semester {semester_id})")
-            for day, start in assigned:
-                slots = self._get_consecutive_slots(start, TUTORIAL_DURATION)
-                if day in avoid_days:
-                    continue
-                for slot in slots:
-                    self._mark_slots_busy_local(schedule, day, [slot], course_code, 'Tutorial')
-                    self._mark_slots_busy_global(day, [slot], department, session, semester_id)
-                    scheduled_slots.append((day, slot))
-            return scheduled_slots
-
-        # Get preferred start slots (ending at :30) and remaining slots
-        preferred_starts, remaining_starts = self._get_preferred_start_slots(TUTORIAL_DURATION, regular_slots)
-        
-        # Build list of all possible (day, start_slot) combinations, prioritizing preferred slots
-        preferred_combinations = []
-        remaining_combinations = []
-        for day in DAYS:
-            for start_slot in preferred_starts:
-                slots = self._get_consecutive_slots(start_slot, TUTORIAL_DURATION)
-                slots = [slot for slot in slots if slot in regular_slots]
-                if len(slots) == TUTORIAL_DURATION:
-                    preferred_combinations.append((day, start_slot, slots))
-            for start_slot in remaining_starts:
-                slots = self._get_consecutive_slots(start_slot, TUTORIAL_DURATION)
-                slots = [slot for slot in slots if slot in regular_slots]
-                if len(slots) == TUTORIAL_DURATION:
-                    remaining_combinations.append((day, start_slot, slots))
-        
-        # Shuffle both lists for randomness
-        random.shuffle(preferred_combinations)
-        random.shuffle(remaining_combinations)
-        
-        # Combine: preferred first, then remaining
-        all_combinations = preferred_combinations + remaining_combinations
-
-        assigned = []
-        scheduled = 0
-        while scheduled < elective_tutorials_per_week and attempts < max_attempts:
-            attempts += 1
-            available_combos = [combo for combo in all_combinations if combo[0] not in used_days and combo[0] not in avoid_days]
-            if not available_combos:
-                available_combos = all_combinations
-            if not available_combos:
-                break
-            
-            day, start_slot, slots = random.choice(available_combos) if available_combos else (None, None, None)
-            if day is None:
-                break
-            
-            if (self._is_time_slot_available_local(schedule, day, slots) and
-                self._is_time_slot_available_global(day, slots, department, session, semester_id)):
-                
-                for slot in slots:
-                    self._mark_slots_busy_local(schedule, day, [slot], course_code, 'Tutorial')
-                    self._mark_slots_busy_global(day, [slot], department, session, semester_id)
-                    scheduled_slots.append((day, slot))
-                assigned.append((day, start_slot))
-                used_days.add(day)
-                avoid_days.add(day)
-                scheduled += 1
-                # Remove this combination from future consideration
-                all_combinations = [c for c in all_combinations if c != (day, start_slot, slots)]
-        
-        if assigned:
-            # Store under common key so ALL elective tutorials in this semester use the same slots
-            # This works across all departments and both Pre-Mid and Post-Mid sessions
-            self.semester_elective_tutorial_slots[common_elective_tutorial_key] = assigned
-            # Also store under course-specific key for backward compatibility
-            self.semester_elective_tutorial_slots[elective_tutorial_key] = assigned
-            print(f"      Assigned common elective tutorial slots for semester {semester_id}: {assigned}")
-        
-        scheduled_count = len(scheduled_slots) // TUTORIAL_DURATION
-        if scheduled_count < elective_tutorials_per_week:
-            print(f"      WARNING: {course_code} - Only scheduled {scheduled_count}/{elective_tutorials_per_week} elective tutorials (attempts: {attempts})")
-        return scheduled_slots
+        shared = (self.semester_elective_tutorial_slots, common_elective_tutorial_key, elective_tutorial_key)
+        return self._schedule_component(schedule, course_code, TUTORIAL_DURATION, 'Tutorial', elective_tutorials_per_week,
+                                        department, session, semester_id, avoid_days,
+                                        shared_slot_cache_key=shared, skip_room=True, required_capacity=required_capacity)
 
     def _schedule_tutorials(self, schedule, course_code, tutorials_per_week, department, session, semester_id, avoid_days=None, is_combined=False, is_elective=False, is_minor=False, required_capacity=0):
         """Schedule tutorial sessions with room allocation, returns list of (day, slot) tuples.
         Prioritizes slots ending at :30, falls back to remaining slots if needed."""
         if tutorials_per_week == 0:
             return []
-
-        scheduled_slots = []
-        attempts = 0
-        max_attempts = 1000
-        used_days = set()
         avoid_days = set(avoid_days or [])
-        regular_slots = [slot for slot in TEACHING_SLOTS if slot not in (MINOR_SLOTS + LUNCH_SLOTS)]
 
         # PRIORITY 1: Handle combined classes first
         if is_combined:
@@ -969,9 +967,7 @@ class ScheduleGenerator:
             )
             if scheduled_count >= tutorials_per_week:
                 return combined_slots
-            # If not all combined slots found, continue with regular scheduling for remaining
-        
-        skip_room_assignment = is_elective or is_minor
+            # If not all combined slots found, regular scheduling only places the remainder
 
         # PRIORITY 2: Handle electives with common slots
         if is_elective:
@@ -980,68 +976,10 @@ class ScheduleGenerator:
                 return elective_slots
 
         # PRIORITY 3: Regular tutorial scheduling
-        # Get preferred start slots (ending at :30) and remaining slots
-        preferred_starts, remaining_starts = self._get_preferred_start_slots(TUTORIAL_DURATION, regular_slots)
-        
-        # Build list of all possible (day, start_slot) combinations, prioritizing preferred slots
-        preferred_combinations = []
-        remaining_combinations = []
-        for day in DAYS:
-            for start_slot in preferred_starts:
-                slots = self._get_consecutive_slots(start_slot, TUTORIAL_DURATION)
-                slots = [slot for slot in slots if slot in regular_slots]
-                if len(slots) == TUTORIAL_DURATION:
-                    preferred_combinations.append((day, start_slot, slots))
-            for start_slot in remaining_starts:
-                slots = self._get_consecutive_slots(start_slot, TUTORIAL_DURATION)
-                slots = [slot for slot in slots if slot in regular_slots]
-                if len(slots) == TUTORIAL_DURATION:
-                    remaining_combinations.append((day, start_slot, slots))
-        
-        # Shuffle both lists for randomness
-        random.shuffle(preferred_combinations)
-        random.shuffle(remaining_combinations)
-        
-        # Combine: preferred first, then remaining
-        all_combinations = preferred_combinations + remaining_combinations
-
-        while len(scheduled_slots) < tutorials_per_week * TUTORIAL_DURATION and attempts < max_attempts:
-            attempts += 1
-            available_combos = [combo for combo in all_combinations if combo[0] not in used_days and combo[0] not in avoid_days]
-            if not available_combos:
-                available_combos = all_combinations
-            if not available_combos:
-                break
-
-            day, start_slot, slots = random.choice(available_combos)
-            
-            room_available = True
-            slots_available = True
-            for slot in slots:
-                if not (self._is_time_slot_available_local(schedule, day, [slot]) and
-                        self._is_time_slot_available_global(day, [slot], department, session, semester_id)):
-                    slots_available = False
-                    break
-            
-            if slots_available:
-                if not skip_room_assignment:
-                    room = self._assign_room(day, start_slot, course_code, department, session, semester_id, 
-                                              is_lab=False, is_combined=False, required_capacity=required_capacity, slots=slots)
-                    room_available = room is not None
-                if room_available:
-                    for slot in slots:
-                        self._mark_slots_busy_local(schedule, day, [slot], course_code, 'Tutorial')
-                        self._mark_slots_busy_global(day, [slot], department, session, semester_id)
-                        scheduled_slots.append((day, slot))
-                    used_days.add(day)
-                    avoid_days.add(day)
-                    all_combinations = [c for c in all_combinations if c != (day, start_slot, slots)]
-
-        scheduled_count = len(scheduled_slots) // TUTORIAL_DURATION
-        if scheduled_count < tutorials_per_week:
-            print(f"      WARNING: {course_code} - Only scheduled {scheduled_count}/{tutorials_per_week} tutorials (attempts: {attempts})")
-        
-        return scheduled_slots
+        return self._schedule_component(schedule, course_code, TUTORIAL_DURATION, 'Tutorial', tutorials_per_week,
+                                        department, session, semester_id, avoid_days,
+                                        skip_room=is_elective or is_minor, required_capacity=required_capacity,
+                                        placed_slots=combined_slots if is_combined else None)
 
     def _schedule_labs(self, schedule, course_code, labs_per_week, department, session, semester_id, avoid_days=None, is_combined=False, is_elective=False, is_minor=False, required_capacity=0):
         """Schedule lab sessions in regular time slots (multi-slot labs) with department-specific lab allocation.
@@ -1049,12 +987,7 @@ class ScheduleGenerator:
         Returns list of (day, slot) tuples."""
         if labs_per_week == 0:
             return []
-        scheduled_slots = []
-        attempts = 0
-        max_attempts = 1000  # Increased for better success rate
-        used_days = set()
         avoid_days = set(avoid_days or [])
-        regular_slots = [slot for slot in TEACHING_SLOTS if slot not in (MINOR_SLOTS + LUNCH_SLOTS)]
         
         # PRIORITY 1: Handle combined classes first
         if is_combined:
@@ -1064,171 +997,146 @@ class ScheduleGenerator:
             )
             if scheduled_count >= labs_per_week:
                 return combined_slots
-            # If not all combined slots found, continue with regular scheduling for remaining
-
-        skip_room_assignment = is_elective or is_minor
+            # If not all combined slots found, regular scheduling only places the remainder
 
         # PRIORITY 2: Department-specific lab scheduling
-        # Get preferred start slots (ending at :30) and remaining slots
-        preferred_starts, remaining_starts = self._get_preferred_start_slots(LAB_DURATION, regular_slots)
-        
-        # Build list of all possible (day, start_slot) combinations, prioritizing preferred slots
-        preferred_combinations = []
-        remaining_combinations = []
-        for day in DAYS:
-            for start_slot in preferred_starts:
-                slots = self._get_consecutive_slots(start_slot, LAB_DURATION)
-                if len(slots) == LAB_DURATION and all(s in regular_slots for s in slots):
-                    preferred_combinations.append((day, start_slot, slots))
-            for start_slot in remaining_starts:
-                slots = self._get_consecutive_slots(start_slot, LAB_DURATION)
-                if len(slots) == LAB_DURATION and all(s in regular_slots for s in slots):
-                    remaining_combinations.append((day, start_slot, slots))
-        
-        # Shuffle both lists for randomness
-        random.shuffle(preferred_combinations)
-        random.shuffle(remaining_combinations)
-        
-        # Combine: preferred first, then remaining
-        all_combinations = preferred_combinations + remaining_combinations
-        
-        while len(scheduled_slots) < labs_per_week * LAB_DURATION and attempts < max_attempts:
-            attempts += 1
-            available_combos = [combo for combo in all_combinations if combo[0] not in used_days and combo[0] not in avoid_days]
-            if not available_combos:
-                available_combos = all_combinations
-            if not available_combos:
-                break
-            
-            day, start_slot, slots = random.choice(available_combos)
-            
-            room_available = True
-            # Check if all slots are available
-            all_available = True
-            for slot in slots:
-                if not (self._is_time_slot_available_local(schedule, day, [slot]) and
-                       self._is_time_slot_available_global(day, [slot], department, session, semester_id)):
-                    all_available = False
-                    break
-            
-            if all_available:
-                if not skip_room_assignment:
-                    room = self._assign_room(day, start_slot, course_code, department, session, semester_id, 
-                                             is_lab=True, is_combined=False, required_capacity=required_capacity, slots=slots)
-                    room_available = room is not None
-                if room_available:
-                    for slot in slots:
-                        self._mark_slots_busy_local(schedule, day, [slot], course_code, 'Lab')
-                        self._mark_slots_busy_global(day, [slot], department, session, semester_id)
-                        scheduled_slots.append((day, slot))
-                    used_days.add(day)
-                    avoid_days.add(day)
-                    all_combinations = [c for c in all_combinations if c != (day, start_slot, slots)]
+        return self._schedule_component(schedule, course_code, LAB_DURATION, 'Lab', labs_per_week,
+                                        department, session, semester_id, avoid_days,
+                                        skip_room=is_elective or is_minor, required_capacity=required_capacity,
+                                        placed_slots=combined_slots if is_combined else None)
 
-        scheduled_count = len(scheduled_slots) // LAB_DURATION
-        if scheduled_count < labs_per_week:
-            print(f"      WARNING: {course_code} - Only scheduled {scheduled_count}/{labs_per_week} labs (attempts: {attempts})")
-        return scheduled_slots
+    def _resolve_columns(self, courses):
+        """Actual column names of a course DataFrame for each _COLUMN_VARIANTS attribute.
+        Resolved once per header layout and cached."""
+        key = tuple(courses.columns)
+        aliases = self._col_aliases.get(key)
+        if aliases is None:
+            aliases = {attr: [col for col in courses.columns if isinstance(col, str) and col.strip() in variants]
+                       for attr, variants in self._COLUMN_VARIANTS.items()}
+            self._col_aliases[key] = aliases
+        return aliases
 
-    def _schedule_course(self, schedule, course, department, session, semester_id):
-        """Schedule all components of a course based on LTPSC with proper room allocation."""
-        course_code = course['Course Code']
-        lectures_per_week = course['Lectures_Per_Week']
-        tutorials_per_week = course['Tutorials_Per_Week']
-        labs_per_week = course['Labs_Per_Week']
-        
-        # Robust elective detection: check multiple column name variants + pattern overrides
-        elective_flag = False
-        for colname in ['Elective (Yes/No)', 'Elective', 'Is Elective', 'Is_Elective']:
-            if colname in course.index:
-                elective_flag = str(course.get(colname, '')).upper() == 'YES'
-                if elective_flag:
-                    break
+    def _schedule_sessions(self, schedule, course_code, per_week, department, session, semester_id, avoid_days=None,
+                           is_combined=False, is_elective=False, is_minor=False, required_capacity=0):
+        """Schedule every SESSION_SPECS component of a course in order.
+        per_week maps count names ('lectures', 'tutorials', 'labs') to sessions per week;
+        returns a dict of count name -> list of (day, slot) tuples."""
+        component_slots = {}
+        for _, name, _, method in SESSION_SPECS:
+            count = per_week.get(name, 0)
+            component_slots[name] = getattr(self, method)(
+                schedule, course_code, count, department, session, semester_id, avoid_days,
+                is_combined=is_combined, is_elective=is_elective, is_minor=is_minor,
+                required_capacity=required_capacity
+            ) if count > 0 else []
+        return component_slots
+
+    def _compute_course_flags(self, courses):
+        """Scheduling flags for every course of a DataFrame, computed column-wise.
+        Returns a DataFrame aligned with courses: elective_flag, combined_flag, is_hss, is_minor,
+        course_code_u, course_name_u and registered_students."""
+        def upper(colname):
+            if colname not in courses.columns:
+                return pd.Series('', index=courses.index, dtype=object)
+            return courses[colname].astype(str).str.upper()
+        
+        aliases = self._resolve_columns(courses)
+        code_u = upper('Course Code')
+        name_u = upper('Course Name')
+        
+        # Robust elective detection: any Yes in the elective column variants + pattern overrides
+        elective = pd.Series(False, index=courses.index)
+        for colname in aliases['elective']:
+            elective |= upper(colname).eq('YES')
         # Pattern overrides: force ELEC as elective; force HSS as not elective
-        course_code_str = str(course.get('Course Code', '')).upper()
-        course_name_str = str(course.get('Course Name', '')).upper()
-        if 'ELEC' in course_code_str or 'ELEC' in course_name_str:
-            elective_flag = True
-        if 'HSS' in course_code_str or 'HSS' in course_name_str:
-            elective_flag = False
-        # Determine if HSS
-        is_hss = ('HSS' in course_code_str) or ('HSS' in course_name_str)
-        is_minor_course = (MINOR_SUBJECT.upper() in course_code_str) or (MINOR_SUBJECT.upper() in course_name_str)
-        
-        # Read Combined Class column (handle multiple column name variants)
-        combined_class_flag = False
-        for colname in ['Combined Class', 'COMBINED CLASS', 'Combined Class ', 'COMBINED CLASS ']:
-            if colname in course.index:
-                combined_class_val = str(course.get(colname, '')).strip().upper()
-                combined_class_flag = combined_class_val == 'YES'
-                if combined_class_flag:
-                    break
-        
-        # Get student count for room capacity
-        registered_students = 0
-        if 'Registered Students' in course.index:
-            try:
-                registered_students = int(float(course.get('Registered Students', 0)))
-            except:
-                registered_students = 0
+        has_elec, is_hss, is_minor = _marker_flags(code_u, name_u)
+        elective = (elective | has_elec) & ~is_hss
+        
+        # Combined Class column (handle multiple column name variants)
+        combined = pd.Series(False, index=courses.index)
+        for colname in aliases['combined']:
+            combined |= upper(colname).str.strip().eq('YES')
+        
+        # Student count for room capacity, already int32 after ExcelLoader.parse_ltpsc; other frames get the
+        # same coercion (unparsable values count as 0)
+        registered = pd.Series(0, index=courses.index)
+        if aliases['registered']:
+            colname = aliases['registered'][0]
+            registered = courses[colname]
+            if registered.dtype != np.int32:
+                # Course Code comes along so the coercion warning can name the courses
+                columns = [colname] + (['Course Code'] if 'Course Code' in courses.columns else [])
+                registered = ExcelLoader._coerce_registered_students(courses[columns].copy())[colname]
+        
+        return pd.DataFrame({
+            'elective_flag': elective.fillna(False).astype(bool),
+            'combined_flag': combined.fillna(False).astype(bool),
+            'is_hss': is_hss,
+            'is_minor': is_minor,
+            'course_code_u': code_u,
+            'course_name_u': name_u,
+            'registered_students': registered,
+        }, index=courses.index)
+
+    def _schedule_course(self, schedule, course_rec, department, session, semester_id, flags=None):
+        """Schedule all components of a course based on LTPSC with proper room allocation.
+        course_rec is the course row as a plain dict (a to_dict('records') entry); flags is its row of
+        _compute_course_flags as a dict, computed here when not given."""
+        course_code = course_rec['Course Code']
+        lectures_per_week = course_rec.get('Lectures_Per_Week', 0)
+        tutorials_per_week = course_rec.get('Tutorials_Per_Week', 0)
+        labs_per_week = course_rec.get('Labs_Per_Week', 0)
+        
+        if flags is None:
+            flags = self._compute_course_flags(pd.DataFrame([course_rec])).to_dict('records')[0]
+        elective_flag = flags['elective_flag']
+        is_minor_course = flags['is_minor']
+        combined_class_flag = flags['combined_flag']
+        registered_students = flags['registered_students']
         
         # IMPORTANT: Follow LTPSC strictly for ALL courses (including electives)
         # Do not override parsed weekly counts; use values from Excel (via parse_ltpsc)
-        elective_status = " [ELECTIVE]" if elective_flag else ""
-        combined_status = " [COMBINED]" if combined_class_flag else ""
-        print(f"      Scheduling {course_code}{elective_status}{combined_status}: L={lectures_per_week}, T={tutorials_per_week}, P={labs_per_week}, Students={registered_students}")
+        logger.info("Scheduling %s%s%s: L=%s, T=%s, P=%s, Students=%s", course_code,
+                    " [ELECTIVE]" if elective_flag else "", " [COMBINED]" if combined_class_flag else "",
+                    lectures_per_week, tutorials_per_week, labs_per_week, registered_students)
         
-        # Track used days for this course scoped to semester+department+session
+        # One key scopes the course to semester+department+session for day tracking, slots and allocations
         scoped_key = (semester_id, department, session, course_code)
-        if scoped_key not in self.scheduled_courses:
-            self.scheduled_courses[scoped_key] = set()
+        days_mask = self.scheduled_courses[scoped_key]
+        # Scheduled slots for conflict tracking are written straight into the per-course day/slot position buffers
+        slot_days = self._scheduled_slot_days[scoped_key]
+        slot_positions = self._scheduled_slot_positions[scoped_key]
 
         success_counts = {'lectures': 0, 'tutorials': 0, 'labs': 0}
-        scheduled_slots = []
-        assigned_rooms = []
-        assigned_lab_rooms = []
 
         # PRIORITY 1: Schedule combined classes first
         # This ensures combined classes get priority for available slots
         avoid_days = set()
         
-        # Schedule lectures
-        if lectures_per_week > 0:
-            lecture_slots = self._schedule_lectures(
-                schedule, course_code, lectures_per_week, department, session, semester_id,
-                avoid_days, is_combined=combined_class_flag, is_elective=elective_flag, 
-                is_minor=is_minor_course, required_capacity=registered_students
-            )
-            scheduled_slots.extend(lecture_slots)
-            success_counts['lectures'] = len(lecture_slots) // LECTURE_DURATION
-        
-        # Schedule tutorials
-        if tutorials_per_week > 0:
-            tutorial_slots = self._schedule_tutorials(
-                schedule, course_code, tutorials_per_week, department, session, semester_id,
-                avoid_days, is_combined=combined_class_flag, is_elective=elective_flag,
-                is_minor=is_minor_course, required_capacity=registered_students
-            )
-            scheduled_slots.extend(tutorial_slots)
-            success_counts['tutorials'] = len(tutorial_slots) // TUTORIAL_DURATION
-        
-        # Schedule labs
-        if labs_per_week > 0:
-            lab_slots = self._schedule_labs(
-                schedule, course_code, labs_per_week, department, session, semester_id,
-                avoid_days, is_combined=combined_class_flag,
-                is_elective=elective_flag, is_minor=is_minor_course,
-                required_capacity=registered_students
-            )
-            scheduled_slots.extend(lab_slots)
-            success_counts['labs'] = len(lab_slots) // LAB_DURATION
+        # Schedule lectures, tutorials and labs in one call
+        per_week = {'lectures': lectures_per_week, 'tutorials': tutorials_per_week, 'labs': labs_per_week}
+        component_slots = self._schedule_sessions(
+            schedule, course_code, per_week, department, session, semester_id, avoid_days,
+            is_combined=combined_class_flag, is_elective=elective_flag,
+            is_minor=is_minor_course, required_capacity=registered_students
+        )
+        # One pass records the slots, the per-component counts and the days used by this course
+        for _, name, duration, _ in SESSION_SPECS:
+            slots = component_slots[name]
+            success_counts[name] = len(slots) // duration
+            for day, slot in slots:
+                day_pos = _DAY_POS[day]
+                slot_days.append(day_pos)
+                slot_positions.append(_SLOT_POS[slot])
+                days_mask |= 1 << day_pos
+        self.scheduled_courses[scoped_key] = days_mask
 
-        # Get assigned rooms for this course
-        allocation_key = (semester_id, department, session, course_code)
-        if allocation_key in self.assigned_rooms:
-            assigned_rooms = [room_info[2] for room_info in self.assigned_rooms[allocation_key]]
-        if allocation_key in self.assigned_lab_rooms:
-            assigned_lab_rooms = [room_info[2] for room_info in self.assigned_lab_rooms[allocation_key]]
+        # First assigned room and lab room for this course (entries are (day, slot, room))
+        allocation_key = scoped_key
+        rooms = self.assigned_rooms.get(allocation_key)
+        first_room = rooms[0][2] if rooms else ''
+        lab_rooms = self.assigned_lab_rooms.get(allocation_key)
+        first_lab = lab_rooms[0][2] if lab_rooms else ''
 
         # Store actual allocation counts with room information
         self.actual_allocations[allocation_key] = {
@@ -1236,53 +1144,60 @@ class ScheduleGenerator:
             'tutorials': success_counts['tutorials'],
             'labs': success_counts['labs'],
             'combined_class': combined_class_flag,
-            'room': assigned_rooms[0] if assigned_rooms else '',
-            'lab_room': assigned_lab_rooms[0] if assigned_lab_rooms else ''
+            'room': first_room,
+            'lab_room': first_lab
         }
 
-        # Store scheduled slots for conflict tracking
-        if scoped_key not in self.scheduled_slots:
-            self.scheduled_slots[scoped_key] = []
-        self.scheduled_slots[scoped_key].extend(scheduled_slots)
-        
-        # Track days used by this course
-        for day, slot in scheduled_slots:
-            self.scheduled_courses[scoped_key].add(day)
-
         return success_counts
 
     def generate_department_schedule(self, semester_id, department, session):
         """Generate a complete weekly schedule for a department and session."""
-        print(f"\nGenerating schedule for {department} {session} (Semester {semester_id})")
+        logger.info("Generating schedule for %s %s (Semester %s)", department, session, semester_id)
         
         # Initialize empty schedule
-        schedule = self._initialize_schedule()
-        
-        # Get courses for this department and session
-        sem_courses = ExcelLoader.get_semester_courses(self.dfs, semester_id)
-        if sem_courses.empty:
-            print(f"WARNING: No courses found for semester {semester_id}")
-            return schedule
+        schedule = self._initialize_grid()
+        
+        # Get courses for this department and session; loaded and LTPSC-parsed once per semester
+        cached = self._sem_cache.get(semester_id)
+        if cached is None:
+            sem_courses = ExcelLoader.get_semester_courses(self.dfs, semester_id)
+            if not sem_courses.empty:
+                # Parse LTPSC
+                cached = (False, ExcelLoader.parse_ltpsc(sem_courses))
+            else:
+                cached = (True, sem_courses)
+            if not cached[1].empty and 'Course Code' in cached[1].columns:
+                # Interned codes share one string object (and its cached hash) across every key they appear in
+                cached[1]['Course Code'] = cached[1]['Course Code'].map(
+                    lambda code: sys.intern(code) if isinstance(code, str) else code)
+            self._sem_cache[semester_id] = cached
+        no_courses, sem_courses = cached
+        if no_courses:
+            logger.warning("No courses found for semester %s", semester_id)
+            return schedule.to_dataframe()
         
-        # Parse LTPSC
-        sem_courses = ExcelLoader.parse_ltpsc(sem_courses)
         if sem_courses.empty:
-            print(f"WARNING: No valid courses after LTPSC parsing for semester {semester_id}")
-            return schedule
+            logger.warning("No valid courses after LTPSC parsing for semester %s", semester_id)
+            return schedule.to_dataframe()
         
         # Filter for department
         if 'Department' in sem_courses.columns:
-            dept_mask = sem_courses['Department'].astype(str).str.contains(f"^{department}$", na=False, regex=True)
+            dept_mask = sem_courses['Department'].astype(str).str.strip().eq(department)
             dept_courses = sem_courses[dept_mask].copy()
         else:
             dept_courses = sem_courses.copy()
         
         if dept_courses.empty:
-            print(f"WARNING: No courses found for {department} in semester {semester_id}")
-            return schedule
+            logger.warning("No courses found for %s in semester %s", department, semester_id)
+            return schedule.to_dataframe()
         
-        # Divide by session
-        pre_mid_courses, post_mid_courses = ExcelLoader.divide_courses_by_session(dept_courses, department, all_sem_courses=sem_courses)
+        # Divide by session (same split for both sessions of a department)
+        split_key = (semester_id, department)
+        split = self._session_split_cache.get(split_key)
+        if split is None:
+            split = ExcelLoader.divide_courses_by_session(dept_courses, department, all_sem_courses=sem_courses)
+            self._session_split_cache[split_key] = split
+        pre_mid_courses, post_mid_courses = split
         
         # Select appropriate session
         if session == PRE_MID:
@@ -1291,8 +1206,8 @@ class ScheduleGenerator:
             session_courses = post_mid_courses
         
         if session_courses.empty:
-            print(f"WARNING: No courses assigned to {department} {session} session")
-            return schedule
+            logger.warning("No courses assigned to %s %s session", department, session)
+            return schedule.to_dataframe()
         
         # Schedule minor classes first (early morning)
         self._schedule_minor_classes(schedule, department, session, semester_id)
@@ -1300,50 +1215,26 @@ class ScheduleGenerator:
         # Schedule each course
         # Sort courses to ensure consistent scheduling order
         # Combined classes and electives get priority
-        course_priority = []
-        regular_courses = []
-        
-        for _, course in session_courses.iterrows():
-            # Check if combined class
-            combined_class_flag = False
-            for colname in ['Combined Class', 'COMBINED CLASS', 'Combined Class ', 'COMBINED CLASS ']:
-                if colname in course.index:
-                    combined_class_val = str(course.get(colname, '')).strip().upper()
-                    combined_class_flag = combined_class_val == 'YES'
-                    break
-            
-            # Check if elective
-            elective_flag = False
-            for colname in ['Elective (Yes/No)', 'Elective', 'Is Elective', 'Is_Elective']:
-                if colname in course.index:
-                    elective_flag = str(course.get(colname, '')).upper() == 'YES'
-                    if elective_flag:
-                        break
-            # Pattern overrides
-            course_code_str = str(course.get('Course Code', '')).upper()
-            course_name_str = str(course.get('Course Name', '')).upper()
-            if 'ELEC' in course_code_str or 'ELEC' in course_name_str:
-                elective_flag = True
-            if 'HSS' in course_code_str or 'HSS' in course_name_str:
-                elective_flag = False
-            
-            if combined_class_flag or elective_flag:
-                course_priority.append(course)
-            else:
-                regular_courses.append(course)
+        # Rows as plain dicts and flags for the whole session computed once, then handed to _schedule_course
+        flags_df = self._compute_course_flags(session_courses)
+        priority_mask = (flags_df['elective_flag'] | flags_df['combined_flag']).to_numpy()
+        records = session_courses.to_dict('records')
+        course_flags = flags_df.to_dict('records')
+        course_priority = [(records[i], course_flags[i]) for i in np.flatnonzero(priority_mask)]
+        regular_courses = [(records[i], course_flags[i]) for i in np.flatnonzero(~priority_mask)]
         
         # Schedule priority courses first (combined classes and electives)
-        print(f"  Scheduling {len(course_priority)} priority courses (combined/electives)...")
-        for course in course_priority:
-            self._schedule_course(schedule, course, department, session, semester_id)
+        logger.info("Scheduling %d priority courses (combined/electives)...", len(course_priority))
+        for course, flags in course_priority:
+            self._schedule_course(schedule, course, department, session, semester_id, flags)
         
         # Schedule regular courses
-        print(f"  Scheduling {len(regular_courses)} regular courses...")
-        for course in regular_courses:
-            self._schedule_course(schedule, course, department, session, semester_id)
+        logger.info("Scheduling %d regular courses...", len(regular_courses))
+        for course, flags in regular_courses:
+            self._schedule_course(schedule, course, department, session, semester_id, flags)
         
-        print(f"Schedule generated for {department} {session}")
-        return schedule
+        logger.info("Schedule generated for %s %s", department, session)
+        return schedule.to_dataframe()
     
     def get_actual_allocations(self, semester_id, department, session, course_code):
         """Get actual number of classes allocated for a course."""
@@ -1361,17 +1252,15 @@ class ScheduleGenerator:
         """Validate room allocation conflicts across all schedules."""
         conflicts = []
         
-        for semester_key, semester_data in self.room_bookings.items():
-            for (day, slot), bookings in semester_data.items():
-                if len(bookings) > 1:
-                    # Multiple courses in same room at same time
-                    conflict = {
-                        'semester': semester_key,
-                        'day': day,
-                        'slot': slot,
-                        'room': bookings[0]['room'],
-                        'entries': [(b['dept'], b['course'], b['session']) for b in bookings]
-                    }
-                    conflicts.append(conflict)
+        for key in self._room_conflict_keys:
+            # Multiple courses in same room at same time
+            semester_key, room_name, day, slot = key
+            conflicts.append({
+                'semester': semester_key,
+                'day': day,
+                'slot': slot,
+                'room': room_name,
+                'entries': [(b.dept, b.course, b.session) for b in self.room_bookings[key]]
+            })
         
         return conflicts
\ No newline at end of file
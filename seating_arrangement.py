@@ -1,17 +1,116 @@
 """Seating arrangement generator for exam classrooms."""
+import numpy as np
 import pandas as pd
+import io
+import itertools
 import random
+import re
 import os
+from datetime import datetime, timedelta
+from collections import defaultdict, deque
 from config import INPUT_DIR, OUTPUT_DIR
 from file_manager import FileManager
 from excel_loader import ExcelLoader
 from exam_scheduler import ExamScheduler
-from openpyxl.styles import PatternFill, Alignment, Font, Border, Side
+from openpyxl import Workbook
+from openpyxl.cell import WriteOnlyCell
+from openpyxl.styles import PatternFill, Alignment, Font, Border, Side, NamedStyle
 from openpyxl.utils import get_column_letter
+from openpyxl.worksheet.dimensions import ColumnDimension
+
+def _pair_students(semesters, course_ids, num_benches):
+    """Bench pairs as (col1, col2) position arrays (-1 = empty seat) for students in list order.
+    
+    Each bench takes the earliest unseated student, paired with the earliest unseated student
+    from another semester, else from the same semester with a different course.
+    """
+    # Bucket positions by semester and by semester -> course, so the earliest compatible
+    # partner is read off the bucket heads instead of rescanning the list
+    semesters = semesters.tolist()
+    course_ids = course_ids.tolist()
+    by_sem = defaultdict(deque)
+    by_sem_course = defaultdict(lambda: defaultdict(deque))
+    for pos, (sem, course) in enumerate(zip(semesters, course_ids)):
+        by_sem[sem].append(pos)
+        by_sem_course[sem][course].append(pos)
+    taken = [False] * len(semesters)
+    
+    def _head(bucket):
+        # Earliest position in the bucket that is still unseated
+        while bucket and taken[bucket[0]]:
+            bucket.popleft()
+        return bucket[0] if bucket else None
+    
+    col1, col2 = [], []
+    pos1 = 0
+    while len(col1) < num_benches:
+        while pos1 < len(semesters) and taken[pos1]:
+            pos1 += 1
+        if pos1 == len(semesters):
+            break
+        taken[pos1] = True
+        sem1 = semesters[pos1]
+        
+        # Strategy 1: earliest student from a different semester (always compatible)
+        heads = [_head(bucket) for sem, bucket in by_sem.items() if sem != sem1]
+        partner = min((h for h in heads if h is not None), default=None)
+        
+        if partner is None:
+            # Strategy 2: earliest student from the same semester but a different course
+            course1 = course_ids[pos1]
+            heads = [_head(bucket) for course, bucket in by_sem_course[sem1].items() if course != course1]
+            partner = min((h for h in heads if h is not None), default=None)
+        
+        if partner is not None:
+            taken[partner] = True
+        col1.append(pos1)
+        col2.append(-1 if partner is None else partner)  # -1: no compatible pair, seated alone
+    return np.array(col1, dtype=np.intp), np.array(col2, dtype=np.intp)
+
+# Sheet column letters by 1-based index (seating sheets are 9 columns wide)
+_COL_LETTERS = [None] + [get_column_letter(col_idx) for col_idx in range(1, 10)]
+
+def _solid_fill(argb):
+    """Solid PatternFill of one ARGB color (8 hex digits, alpha first)."""
+    return PatternFill(start_color=argb, end_color=argb, fill_type="solid")
+
+# Seating sheet cell styles, shared by every workbook: named style -> (fill, font)
+_CENTER_ALIGN = Alignment(horizontal='center', vertical='center', wrap_text=True)
+_STUDENT_FONT = Font(size=9, color="FF000000")
+_SEATING_STYLES = {
+    'seating_room_header': (_solid_fill("FF4472C4"), Font(bold=True, size=14, color="FFFFFFFF")),  # Blue, white text
+    'seating_section_header': (_solid_fill("FF366092"), Font(bold=True, size=11, color="FFFFFFFF")),  # Dark blue, white text
+    'seating_window': (_solid_fill("FFB4C6E7"), Font(bold=True, size=12, color="FF000000")),  # Light blue
+    'seating_door': (_solid_fill("FFD9E1F2"), Font(bold=True, size=11, color="FF000000")),  # Very light blue
+    'seating_col_header': (_solid_fill("FF70AD47"), Font(bold=True, size=10, color="FFFFFFFF")),  # Green
+    'seating_col1': (_solid_fill("FFE2EFDA"), _STUDENT_FONT),  # Light green
+    'seating_col2': (_solid_fill("FFFFF2CC"), _STUDENT_FONT),  # Light yellow
+    'seating_col3': (_solid_fill("FFFCE4D6"), _STUDENT_FONT),  # Light orange
+    'seating_col4': (_solid_fill("FFDEEBF7"), _STUDENT_FONT),  # Light blue
+}
+
+# Separator between course codes in an exam timetable cell (surrounding whitespace included)
+_COURSE_SEPARATOR = re.compile(r'\s*,\s*')
 
 class SeatingArrangementGenerator:
     """Generates seating arrangements for exam classrooms."""
     
+    # Roll-number department group -> course sheet Department codes its students take.
+    # Both columns are Categorical so the merges below compare integer codes, not strings
+    _ROLL_GROUPS = pd.CategoricalDtype(['BCS', 'BDS', 'BEC'])
+    _ROLL_DEPARTMENTS = pd.DataFrame({
+        'group': pd.Categorical(['BCS', 'BCS', 'BCS', 'BDS', 'BEC'], dtype=_ROLL_GROUPS),
+        'Department': pd.Categorical(['CSE', 'CSE-A', 'CSE-B', 'DSAI', 'ECE']),
+    })
+    
+    # Rows per day/session block of a seating sheet (see _create_seating_section)
+    _SECTION_ROWS = 14
+    
+    # Exam timetable day columns, in order (the second week starts on Monday again)
+    _EXAM_DAYS = ['Saturday', 'Monday', 'Tuesday', 'Wednesday', 'Thursday', 'Friday', 'Monday']
+    # Every (day, session) exam slot in sheet order, flattened once
+    _DAY_SESSIONS = tuple(itertools.product(_EXAM_DAYS, ('FN', 'AN')))
+    
     def __init__(self, data_frames, schedule_generator):
         self.dfs = data_frames
         self.schedule_gen = schedule_generator
@@ -24,8 +123,29 @@ class SeatingArrangementGenerator:
         # Performance optimization: Cache semester courses and student-course mappings
         self._semester_courses_cache = {}  # Cache for semester courses
         self._student_courses_cache = {}  # Cache for student courses: (roll_no, semester) -> courses
-        self._course_students_index = {}  # Reverse index: (semester, course) -> [students]
+        # Reverse index as parallel arrays, one entry per (student, course) pair, grouped by
+        # (semester, course); _course_offsets maps each group to its [start, end) slice
+        self._student_roll = np.empty(0, dtype=object)
+        self._student_roll_id = np.empty(0, dtype=np.int32)
+        self._student_name = pd.Categorical([])
+        self._student_department = pd.Categorical([])
+        self._student_semester = np.empty(0, dtype=np.int32)
+        self._student_course_id = np.empty(0, dtype=np.int32)
+        self._course_offsets = {}
         self._precompute_student_courses()
+        
+        # Invert the exam schedule once: (day, session) -> courses, in schedule order
+        self._slot_to_courses = {}
+        for (exam_day, exam_session, course) in self.exam_schedule:
+            self._slot_to_courses.setdefault((exam_day, exam_session), []).append(course)
+        # Flatten the offsets to course -> [student ids] in one pass, semesters in cache order
+        sem_rank = {semester: i for i, semester in enumerate(self._semester_courses_cache)}
+        self._course_to_students = {}
+        for (semester, course), (start, end) in sorted(self._course_offsets.items(), key=lambda item: sem_rank[item[0][0]]):
+            self._course_to_students.setdefault(course, []).append(np.arange(start, end))
+        self._course_to_students = {course: np.concatenate(ids) for course, ids in self._course_to_students.items()}
+        self._slot_students_cache = {}  # (day, session) -> ids of students with an exam in that slot
+        self._day_to_date_cache = {}  # tuple(exam_days) -> {day: 'dd/mm/YYYY'}
     
     def _load_student_data(self):
         """Load student data from student_data.xlsx."""
@@ -43,6 +163,18 @@ class SeatingArrangementGenerator:
         
         return student_df
     
+    def _parse_schedule_df(self, df, exam_type, session, exam_schedule):
+        """Add (day, session, course) -> exam_type entries from one exam timetable frame."""
+        if df.empty:
+            return
+        row = df.iloc[0].to_dict()  # One row: day column -> comma-separated courses
+        for day in self._EXAM_DAYS:
+            courses_str = row.get(day, '')
+            if courses_str and str(courses_str).strip():
+                for course in _COURSE_SEPARATOR.split(str(courses_str).strip()):
+                    if course:
+                        exam_schedule[(day, session, course)] = exam_type
+    
     def _get_exam_schedule(self):
         """Get exam schedule to know which courses are on which day/session."""
         exam_schedule = {}
@@ -51,58 +183,13 @@ class SeatingArrangementGenerator:
         pre_mid_courses = self.exam_scheduler.get_all_pre_mid_courses()
         post_mid_courses = self.exam_scheduler.get_all_post_mid_courses()
         
-        # Schedule exams to get day/session assignments
-        if not pre_mid_courses.empty:
-            mid_fn_df, mid_an_df = self.exam_scheduler.schedule_exams(pre_mid_courses, num_days=7)
-            exam_days = ['Saturday', 'Monday', 'Tuesday', 'Wednesday', 'Thursday', 'Friday', 'Monday']
-            
-            # Parse FN schedule
-            for day in exam_days:
-                if day in mid_fn_df.columns:
-                    courses_str = mid_fn_df[day].iloc[0] if not mid_fn_df.empty else ''
-                    if courses_str and str(courses_str).strip():
-                        courses = [c.strip() for c in str(courses_str).split(',')]
-                        for course in courses:
-                            if course:
-                                key = (day, 'FN', course.strip())
-                                exam_schedule[key] = 'Pre-Mid'
-            
-            # Parse AN schedule
-            for day in exam_days:
-                if day in mid_an_df.columns:
-                    courses_str = mid_an_df[day].iloc[0] if not mid_an_df.empty else ''
-                    if courses_str and str(courses_str).strip():
-                        courses = [c.strip() for c in str(courses_str).split(',')]
-                        for course in courses:
-                            if course:
-                                key = (day, 'AN', course.strip())
-                                exam_schedule[key] = 'Pre-Mid'
-        
-        if not post_mid_courses.empty:
-            end_fn_df, end_an_df = self.exam_scheduler.schedule_exams(post_mid_courses, num_days=7)
-            exam_days = ['Saturday', 'Monday', 'Tuesday', 'Wednesday', 'Thursday', 'Friday', 'Monday']
-            
-            # Parse FN schedule
-            for day in exam_days:
-                if day in end_fn_df.columns:
-                    courses_str = end_fn_df[day].iloc[0] if not end_fn_df.empty else ''
-                    if courses_str and str(courses_str).strip():
-                        courses = [c.strip() for c in str(courses_str).split(',')]
-                        for course in courses:
-                            if course:
-                                key = (day, 'FN', course.strip())
-                                exam_schedule[key] = 'Post-Mid'
-            
-            # Parse AN schedule
-            for day in exam_days:
-                if day in end_an_df.columns:
-                    courses_str = end_an_df[day].iloc[0] if not end_an_df.empty else ''
-                    if courses_str and str(courses_str).strip():
-                        courses = [c.strip() for c in str(courses_str).split(',')]
-                        for course in courses:
-                            if course:
-                                key = (day, 'AN', course.strip())
-                                exam_schedule[key] = 'Post-Mid'
+        # Schedule exams to get day/session assignments, then record each session's courses
+        for courses, exam_type in ((pre_mid_courses, 'Pre-Mid'), (post_mid_courses, 'Post-Mid')):
+            if courses.empty:
+                continue
+            fn_df, an_df = self.exam_scheduler.schedule_exams(courses, num_days=7)
+            for df, session in ((fn_df, 'FN'), (an_df, 'AN')):
+                self._parse_schedule_df(df, exam_type, session, exam_schedule)
         
         return exam_schedule
     
@@ -134,35 +221,22 @@ class SeatingArrangementGenerator:
         if room_col is None:
             room_col = classroom_df.columns[0]
         
-        for _, row in classroom_df.iterrows():
-            room_name = str(row.get(room_col, '')).strip()
-            if room_name in self.exam_classrooms:
-                # Prefer exam capacity, fallback to regular capacity
-                capacity = 48  # Default
-                
-                if exam_cap_col:
-                    try:
-                        exam_cap = row.get(exam_cap_col)
-                        if pd.notna(exam_cap) and str(exam_cap).strip() and str(exam_cap).strip().lower() not in ['nil', 'none', '0', '']:
-                            capacity = int(float(exam_cap))
-                        elif exam_cap_col and capacity == 48 and cap_col:
-                            # Fallback to regular capacity if exam capacity is 0/nil
-                            try:
-                                reg_cap = int(float(row.get(cap_col, 48)))
-                                # Use half of regular capacity as exam capacity (typical)
-                                capacity = max(48, reg_cap // 2)
-                            except:
-                                pass
-                    except:
-                        pass
-                elif cap_col:
-                    try:
-                        reg_cap = int(float(row.get(cap_col, 48)))
-                        capacity = max(48, reg_cap // 2)  # Use half of regular capacity
-                    except:
-                        pass
-                
-                capacities[room_name] = capacity
+        # Exam rooms only; a later row for the same room overrides an earlier one
+        rooms = classroom_df[room_col].map(str).str.strip()
+        in_exam = rooms.isin(self.exam_classrooms)
+        rooms = rooms[in_exam]
+        
+        def numeric(col):
+            # Non-numeric cells (e.g. 'nil') become NaN
+            if col is None:
+                return pd.Series(np.nan, index=rooms.index)
+            return pd.to_numeric(classroom_df.loc[in_exam, col], errors='coerce')
+        
+        # Prefer a positive exam capacity; otherwise use half of regular capacity (typical), at least 48 (default)
+        regular = (numeric(cap_col) // 2).clip(lower=48).fillna(48)
+        exam = numeric(exam_cap_col)
+        capacity = exam.where(exam.gt(0), regular).astype(int)
+        capacities.update(zip(rooms, capacity))
         
         # Set default for rooms not found (6 rows × 4 columns × 2 = 48)
         for room in self.exam_classrooms:
@@ -187,53 +261,56 @@ class SeatingArrangementGenerator:
                 sem_courses = ExcelLoader.get_semester_courses(self.dfs, int(semester))
                 self._semester_courses_cache[int(semester)] = sem_courses
         
-        # Pre-compute student courses and build reverse index
-        for _, student in self.student_data.iterrows():
-            roll_no = str(student.get('Roll No', '')).strip()
-            semester = student.get('Semester', None)
-            
-            if not roll_no or pd.isna(semester):
-                continue
-            
-            semester = int(semester)
-            cache_key = (roll_no, semester)
-            
-            if cache_key not in self._student_courses_cache:
-                # Extract department from roll number
-                dept_codes = []
-                if 'BCS' in roll_no:
-                    dept_codes = ['CSE', 'CSE-A', 'CSE-B']
-                elif 'BDS' in roll_no:
-                    dept_codes = ['DSAI']
-                elif 'BEC' in roll_no:
-                    dept_codes = ['ECE']
-                
-                courses = []
-                if dept_codes and semester in self._semester_courses_cache:
-                    sem_courses = self._semester_courses_cache[semester]
-                    if not sem_courses.empty and 'Department' in sem_courses.columns:
-                        for dept_code in dept_codes:
-                            dept_mask = sem_courses['Department'].astype(str) == dept_code
-                            dept_courses = sem_courses[dept_mask]
-                            if 'Course Code' in dept_courses.columns:
-                                dept_course_list = dept_courses['Course Code'].dropna().unique().tolist()
-                                courses.extend([str(c).strip() for c in dept_course_list])
-                
-                courses = list(set([c for c in courses if c]))
-                self._student_courses_cache[cache_key] = courses
-                
-                # Build reverse index: course -> students
-                for course in courses:
-                    index_key = (semester, course)
-                    if index_key not in self._course_students_index:
-                        self._course_students_index[index_key] = []
-                    self._course_students_index[index_key].append({
-                        'Roll No': roll_no,
-                        'Name': student.get('Name', ''),
-                        'Semester': semester,
-                        'Department': student.get('Department', ''),
-                        'Course': course
-                    })
+        # Students: one row per (roll number, semester), first occurrence wins, in file order
+        student_df = self.student_data
+        roll = student_df['Roll No'].map(str).str.strip() if 'Roll No' in student_df.columns else pd.Series('', index=student_df.index)
+        students = pd.DataFrame({
+            'roll': roll,
+            'semester': pd.to_numeric(student_df['Semester'], errors='coerce'),
+            'name': student_df['Name'] if 'Name' in student_df.columns else '',
+            'department': student_df['Department'] if 'Department' in student_df.columns else '',
+        })
+        students = students[students['roll'].ne('') & students['semester'].notna()]
+        students = students.astype({'semester': int}).drop_duplicates(['roll', 'semester'])
+        # Department group from the roll number (BCS -> CSE sections, BDS -> DSAI, BEC -> ECE; else missing)
+        students['group'] = pd.Categorical(np.select(
+            [students['roll'].str.contains(code, regex=False) for code in ('BCS', 'BDS', 'BEC')],
+            ['BCS', 'BDS', 'BEC'], default=''), dtype=self._ROLL_GROUPS)
+        
+        # Courses: one row per (semester, department group, course code) over all cached semesters
+        course_frames = [
+            pd.DataFrame({'semester': semester,
+                          'Department': sem_courses['Department'].astype(str).astype(self._ROLL_DEPARTMENTS['Department'].dtype),
+                          'course': sem_courses['Course Code']})
+            for semester, sem_courses in self._semester_courses_cache.items()
+            if not sem_courses.empty and 'Department' in sem_courses.columns and 'Course Code' in sem_courses.columns
+        ]
+        if course_frames:
+            courses = pd.concat(course_frames, ignore_index=True).dropna(subset=['course'])
+            courses['course'] = courses['course'].map(str).str.strip()
+            courses = courses[courses['course'].ne('')].merge(self._ROLL_DEPARTMENTS, on='Department')
+            courses = courses.drop_duplicates(['semester', 'group', 'course'])[['semester', 'group', 'course']]
+        else:
+            courses = pd.DataFrame(columns=['semester', 'group', 'course'])
+        
+        # Every student gets a cache entry; an inner merge keeps students in file order.
+        # Pairs are unique per (roll, semester, course), so the grouped lists need no dedupe
+        self._student_courses_cache.update(
+            (key, []) for key in zip(students['roll'], students['semester']))
+        pairs = students[students['group'].notna()].merge(courses, on=['semester', 'group'])
+        self._student_courses_cache.update(
+            pairs.groupby(['roll', 'semester'], sort=False)['course'].agg(list).to_dict())
+        
+        # Build reverse index: group pairs by (semester, course), file order kept within a group
+        pairs = pairs.sort_values(['semester', 'course'], kind='stable', ignore_index=True)
+        self._student_roll = pairs['roll'].to_numpy(dtype=object)
+        self._student_roll_id = pd.factorize(pairs['roll'])[0].astype(np.int32)
+        self._student_name = pd.Categorical(pairs['name'].astype(str))
+        self._student_department = pd.Categorical(pairs['department'].astype(str))
+        self._student_semester = pairs['semester'].to_numpy(dtype=np.int32)
+        self._student_course_id = pd.factorize(pairs['course'])[0].astype(np.int32)
+        for (semester, course), ids in pairs.groupby(['semester', 'course'], sort=False).indices.items():
+            self._course_offsets[(int(semester), course)] = (int(ids[0]), int(ids[-1]) + 1)
         
         print(f"  Cached {len(self._student_courses_cache)} student-course mappings")
     
@@ -243,61 +320,36 @@ class SeatingArrangementGenerator:
         return self._student_courses_cache.get(cache_key, [])
     
     def _get_students_for_exam(self, day, session):
-        """Get all students who have exams on this day/session (optimized using reverse index)."""
-        students_with_exams = []
-        students_added = set()  # Track to avoid duplicates
-        
-        # Get courses scheduled for this day/session
-        exam_courses = []
-        for (exam_day, exam_session, course), exam_type in self.exam_schedule.items():
-            if exam_day == day and exam_session == session:
-                exam_courses.append(course)
-        
-        if not exam_courses:
-            return students_with_exams
-        
-        # Use reverse index for fast lookup
-        for course in exam_courses:
-            # Check all semesters for this course
-            for semester in self._semester_courses_cache.keys():
-                index_key = (semester, course)
-                if index_key in self._course_students_index:
-                    for student in self._course_students_index[index_key]:
-                        roll_no = student['Roll No']
-                        if roll_no not in students_added:
-                            students_with_exams.append(student)
-                            students_added.add(roll_no)
-        
+        """Get ids of all students who have exams on this day/session (memoized per slot as a tuple)."""
+        cached = self._slot_students_cache.get((day, session))
+        if cached is not None:
+            return cached
+        
+        ids = [self._course_to_students[course] for course in self._slot_to_courses.get((day, session), ())
+               if course in self._course_to_students]
+        students_with_exams = ()
+        if ids:
+            ids = np.concatenate(ids)
+            # Keep each roll number's first occurrence, in order
+            _, first = np.unique(self._student_roll_id[ids], return_index=True)
+            students_with_exams = tuple(ids[np.sort(first)].tolist())
+        
+        self._slot_students_cache[(day, session)] = students_with_exams
         return students_with_exams
     
     def _can_sit_together(self, student1, student2, day, session):
-        """Check if two students can sit together (no exam conflict)."""
-        # Different semesters - always OK
-        if student1['Semester'] != student2['Semester']:
+        """Check if two students (index ids) can sit together (no exam conflict)."""
+        # Different semesters - always OK; same semester only with different course exams
+        if self._student_semester[student1] != self._student_semester[student2]:
             return True
-        
-        # Same semester - check if they have same exam
-        course1 = student1.get('Course', '')
-        course2 = student2.get('Course', '')
-        
-        # If no course info, be safe and say no
-        if not course1 or not course2:
-            return False
-        
-        # Same course exam - conflict!
-        if course1 == course2:
-            return False
-        
-        # Different courses, same semester - OK
-        return True
+        return self._student_course_id[student1] != self._student_course_id[student2]
     
     def _generate_seating_for_room_with_students(self, room_name, capacity, students):
-        """Generate seating arrangement for a specific room with given students list."""
-        if not students:
-            return pd.DataFrame()
-        
-        # Shuffle students for random distribution
-        random.shuffle(students)
+        """Generate seating arrangement for a specific room from already-shuffled student ids.
+        Returns the bench DataFrame and an array of the ids left unseated, in order."""
+        unassigned = np.asarray(students, dtype=np.intp)
+        if len(unassigned) == 0:
+            return pd.DataFrame(), unassigned
         
         # Calculate number of benches based on 6 rows × 4 columns layout
         # Each bench has 2 students, so max capacity = 6 rows × 4 columns × 2 = 48 students
@@ -310,90 +362,46 @@ class SeatingArrangementGenerator:
         # Ensure we don't exceed 6 rows × 4 columns = 24 benches
         num_benches = min(num_benches, 6 * 4)
         
-        # Create seating arrangement
-        seating_data = []
-        bench_num = 1
-        
         # Pair students: prefer different semesters, then same semester different courses
-        unassigned = students.copy()
-        random.shuffle(unassigned)  # Randomize for better distribution
-        
-        while bench_num <= num_benches and unassigned:
-            if len(unassigned) == 1:
-                # Only one student left - assign alone
-                student = unassigned[0]
-                seating_data.append({
-                    'Bench': bench_num,
-                    'COL1': student['Roll No'],
-                    'COL2': ''
-                })
-                unassigned.remove(student)
-                bench_num += 1
+        col1, col2 = _pair_students(self._student_semester[unassigned], self._student_course_id[unassigned], num_benches)
+        
+        if len(col1) == 0:
+            return pd.DataFrame(), unassigned
+        seated = np.zeros(len(unassigned), dtype=bool)
+        seated[col1] = True
+        seated[col2[col2 >= 0]] = True
+        
+        # Roll numbers are read back only here, one array gather per column
+        rolls = self._student_roll[unassigned]
+        df = pd.DataFrame({
+            'Bench': np.arange(1, len(col1) + 1),
+            'COL1': rolls[col1],
+            'COL2': np.where(col2 >= 0, rolls[col2], ''),
+        })
+        return df, unassigned[~seated]
+    
+    def _seat_exam_slot(self, students):
+        """Seat one exam slot's shuffled student ids across the exam rooms, in room order.
+        Returns {room_name: bench DataFrame} for the rooms that received students."""
+        seating = {}
+        remaining = np.asarray(students, dtype=np.intp)  # Converted once; rooms pass the array on
+        for room_name in self.exam_classrooms:
+            if len(remaining) == 0:
                 break
-            
-            student1 = unassigned[0]
-            compatible_found = False
-            
-            # Strategy 1: Find student from different semester (fastest check)
-            sem1 = student1['Semester']
-            for student2 in unassigned[1:]:
-                if student2['Semester'] != sem1:
-                    # Different semester - always compatible
-                    seating_data.append({
-                        'Bench': bench_num,
-                        'COL1': student1['Roll No'],
-                        'COL2': student2['Roll No']
-                    })
-                    unassigned.remove(student1)
-                    unassigned.remove(student2)
-                    compatible_found = True
-                    bench_num += 1
-                    break
-            
-            if not compatible_found:
-                # Strategy 2: Find student from same semester but different course
-                course1 = student1.get('Course', '')
-                for student2 in unassigned[1:]:
-                    if student2['Semester'] == sem1:
-                        course2 = student2.get('Course', '')
-                        if course1 and course2 and course1 != course2:
-                            # Same semester, different courses - compatible
-                            seating_data.append({
-                                'Bench': bench_num,
-                                'COL1': student1['Roll No'],
-                                'COL2': student2['Roll No']
-                            })
-                            unassigned.remove(student1)
-                            unassigned.remove(student2)
-                            compatible_found = True
-                            bench_num += 1
-                            break
-            
-            if not compatible_found:
-                # No compatible pair found - assign alone
-                seating_data.append({
-                    'Bench': bench_num,
-                    'COL1': student1['Roll No'],
-                    'COL2': ''
-                })
-                unassigned.remove(student1)
-                bench_num += 1
-        
-        if not seating_data:
-            return pd.DataFrame()
-        
-        df = pd.DataFrame(seating_data)
-        return df
+            capacity = self.classroom_capacities.get(room_name, 50)
+            seating_df, remaining = self._generate_seating_for_room_with_students(room_name, capacity, remaining)
+            if not seating_df.empty:
+                seating[room_name] = seating_df
+        return seating
     
     def _generate_seating_for_room(self, room_name, capacity, day, session):
         """Generate seating arrangement for a specific room, day, and session (legacy method)."""
-        students = self._get_students_for_exam(day, session)
-        return self._generate_seating_for_room_with_students(room_name, capacity, students)
+        students = list(self._get_students_for_exam(day, session))
+        random.shuffle(students)  # Randomize for better distribution
+        return self._generate_seating_for_room_with_students(room_name, capacity, students)[0]
     
-    def _get_date_for_day(self, day, exam_days):
-        """Get date for a given exam day."""
-        from datetime import datetime, timedelta
-        
+    def _build_day_to_date(self, exam_days):
+        """Formatted date (dd/mm/YYYY) of each exam day; a repeated day keeps its last date."""
         # Find next Saturday from today (or use a fixed start date)
         start_date = datetime(2025, 9, 20)  # Saturday, Sept 20, 2025
         
@@ -410,297 +418,142 @@ class SeatingArrangementGenerator:
                     days_to_add = 2  # Skip Sunday
                 elif prev_day == 'Friday':
                     days_to_add = 3  # Skip weekend
-                elif prev_day == 'Monday' and i > 1:
-                    days_to_add = 1
                 else:
                     days_to_add = 1
                 
                 current_date += timedelta(days=days_to_add)
                 day_to_date[exam_day] = current_date
         
-        if day in day_to_date:
-            return day_to_date[day].strftime('%d/%m/%Y')
-        return day
+        return {exam_day: date.strftime('%d/%m/%Y') for exam_day, date in day_to_date.items()}
     
-    def _create_seating_section(self, day, session, seating_df, exam_days):
-        """Create a seating section for one day/session combination."""
-        if seating_df.empty:
-            return []
-        
-        rows = []
-        
+    def _get_date_for_day(self, day, exam_days):
+        """Get date for a given exam day (date table built once per exam-day list)."""
+        key = tuple(exam_days)
+        day_to_date = self._day_to_date_cache.get(key)
+        if day_to_date is None:
+            day_to_date = self._day_to_date_cache[key] = self._build_day_to_date(exam_days)
+        return day_to_date.get(day, day)
+    
+    def _create_seating_section(self, day, session, seating_df, exam_days, out):
+        """Write a seating section for one day/session combination into `out`,
+        a blank (_SECTION_ROWS x 9) object array view; rows are laid out as:
+        header, blank, WINDOW, blank, column headers, 6 bench rows, blank, Door, blank."""
         # Get formatted date
         date_str = self._get_date_for_day(day, exam_days)
         
         # Section header: Day, Date, Session
-        header_row = [f'{day} - {date_str} - {session}'] + [''] * 8
-        rows.append(header_row)
-        rows.append([''] * 9)  # Empty row
+        out[0, 0] = f'{day} - {date_str} - {session}'
         
         # WINDOW label
-        window_row = ['WINDOW'] + [''] * 8
-        rows.append(window_row)
-        rows.append([''] * 9)  # Empty row
+        out[2, 0] = 'WINDOW'
         
         # Column headers
-        col_header = ['', 'COL1', '', 'COL2', '', 'COL3', '', 'COL4', '']
-        rows.append(col_header)
+        out[4] = ['', 'COL1', '', 'COL2', '', 'COL3', '', 'COL4', '']
         
-        # Arrange benches in 6 rows × 4 columns format
-        max_benches = len(seating_df)
-        num_rows = 6
-        benches_per_col = num_rows  # 6 rows per column
-        
-        # Create 6 rows for seating
-        for row_idx in range(num_rows):
-            row_data = ['']  # First column is empty
-            
-            # COL1
-            bench1_idx = row_idx
-            if bench1_idx < max_benches:
-                bench1 = seating_df.iloc[bench1_idx]
-                row_data.append(bench1['COL1'])
-                row_data.append(bench1['COL2'] if bench1['COL2'] else '')
-            else:
-                row_data.append('')
-                row_data.append('')
-            
-            # COL2
-            bench2_idx = row_idx + benches_per_col
-            if bench2_idx < max_benches:
-                bench2 = seating_df.iloc[bench2_idx]
-                row_data.append(bench2['COL1'])
-                row_data.append(bench2['COL2'] if bench2['COL2'] else '')
-            else:
-                row_data.append('')
-                row_data.append('')
-            
-            # COL3
-            bench3_idx = row_idx + benches_per_col * 2
-            if bench3_idx < max_benches:
-                bench3 = seating_df.iloc[bench3_idx]
-                row_data.append(bench3['COL1'])
-                row_data.append(bench3['COL2'] if bench3['COL2'] else '')
-            else:
-                row_data.append('')
-                row_data.append('')
-            
-            # COL4
-            bench4_idx = row_idx + benches_per_col * 3
-            if bench4_idx < max_benches:
-                bench4 = seating_df.iloc[bench4_idx]
-                row_data.append(bench4['COL1'])
-                row_data.append(bench4['COL2'] if bench4['COL2'] else '')
-            else:
-                row_data.append('')
-                row_data.append('')
-            
-            rows.append(row_data)
+        # Arrange benches in 6 rows × 4 columns format: benches fill COL1 top to bottom, then COL2, ...
+        # Each column group is two sheet columns (COL1 and COL2 seat of the bench)
+        num_rows, num_cols = 6, 4
+        benches = np.full((num_cols * num_rows, 2), '', dtype=object)
+        seats = seating_df[['COL1', 'COL2']].to_numpy()[:num_cols * num_rows]
+        benches[:len(seats)] = seats
+        out[5:5 + num_rows, 1:1 + 2 * num_cols] = benches.reshape(num_cols, num_rows, 2).transpose(1, 0, 2).reshape(num_rows, -1)
         
         # Door label
-        rows.append([''] * 9)  # Empty row
-        door_row = ['Door'] + [''] * 8
-        rows.append(door_row)
-        rows.append([''] * 9)  # Empty row separator
-        
-        return rows
+        out[12, 0] = 'Door'
     
     def _create_seating_sheet(self, room_name, seating_data_by_day_session, exam_days):
-        """Create a combined seating arrangement sheet for one room showing all days and sessions."""
-        rows = []
-        
-        # Room header
-        room_header = [f'Room: {room_name}'] + [''] * 8
-        rows.append(room_header)
-        rows.append([''] * 9)  # Empty row
-        
-        # Create sections for each day/session combination
-        exam_days_list = ['Saturday', 'Monday', 'Tuesday', 'Wednesday', 'Thursday', 'Friday', 'Monday']
-        sessions = ['FN', 'AN']
-        
-        for day in exam_days_list:
-            for session in sessions:
-                key = (day, session)
-                if key in seating_data_by_day_session:
-                    seating_df = seating_data_by_day_session[key]
-                    if not seating_df.empty:
-                        section_rows = self._create_seating_section(day, session, seating_df, exam_days)
-                        rows.extend(section_rows)
-        
-        # Create DataFrame
-        max_cols = max(len(row) for row in rows) if rows else 9
-        padded_rows = []
-        for row in rows:
-            padded_row = row + [''] * (max_cols - len(row))
-            padded_rows.append(padded_row)
-        
-        df = pd.DataFrame(padded_rows)
-        return df
+        """Create a combined seating arrangement sheet for one room showing all days and sessions.
+        
+        Returns the sheet as a fixed 9-column object array and the 1-based worksheet rows of each
+        row kind ('room', 'section', 'window', 'door', 'col_header') for _write_seating_sheet.
+        """
+        # Sections for each day/session combination with seating, in sheet order
+        sections = [(day, session, seating_data_by_day_session[(day, session)])
+                    for day, session in self._DAY_SESSIONS
+                    if (day, session) in seating_data_by_day_session
+                    and not seating_data_by_day_session[(day, session)].empty]
+        
+        # Room header and a blank row, then one fixed-size block per section
+        sheet = np.full((2 + self._SECTION_ROWS * len(sections), 9), '', dtype=object)
+        sheet[0, 0] = f'Room: {room_name}'
+        row_kinds = {'room': [1], 'section': [], 'window': [], 'door': [], 'col_header': []}
+        
+        for i, (day, session, seating_df) in enumerate(sections):
+            start = 2 + self._SECTION_ROWS * i
+            self._create_seating_section(day, session, seating_df, exam_days,
+                                         sheet[start:start + self._SECTION_ROWS])
+            # Worksheet rows are 1-based
+            row_kinds['section'].append(start + 1)
+            row_kinds['window'].append(start + 3)
+            row_kinds['col_header'].append(start + 5)
+            row_kinds['door'].append(start + 13)
+        
+        return sheet, row_kinds
     
-    def _format_seating_sheet(self, worksheet, room_name, day, session):
-        """Apply color coding and formatting to seating arrangement sheet."""
-        try:
-            from openpyxl.styles import PatternFill, Alignment, Font, Border, Side
-            
-            max_row = worksheet.max_row
-            max_col = worksheet.max_column
-            
-            if max_row == 0 or max_col == 0:
-                return
-            
-            # Define colors
-            room_header_fill = PatternFill(start_color="4472C4", end_color="4472C4", fill_type="solid")  # Blue
-            room_header_font = Font(bold=True, size=14, color="FFFFFF")  # White text
-            
-            section_header_fill = PatternFill(start_color="366092", end_color="366092", fill_type="solid")  # Dark blue
-            section_header_font = Font(bold=True, size=11, color="FFFFFF")  # White text
-            
-            window_fill = PatternFill(start_color="B4C6E7", end_color="B4C6E7", fill_type="solid")  # Light blue
-            window_font = Font(bold=True, size=12, color="000000")
-            
-            door_fill = PatternFill(start_color="D9E1F2", end_color="D9E1F2", fill_type="solid")  # Very light blue
-            door_font = Font(bold=True, size=11, color="000000")
-            
-            col1_fill = PatternFill(start_color="E2EFDA", end_color="E2EFDA", fill_type="solid")  # Light green
-            col2_fill = PatternFill(start_color="FFF2CC", end_color="FFF2CC", fill_type="solid")  # Light yellow
-            col3_fill = PatternFill(start_color="FCE4D6", end_color="FCE4D6", fill_type="solid")  # Light orange
-            col4_fill = PatternFill(start_color="DEEBF7", end_color="DEEBF7", fill_type="solid")  # Light blue
-            
-            col_header_fill = PatternFill(start_color="70AD47", end_color="70AD47", fill_type="solid")  # Green
-            col_header_font = Font(bold=True, size=10, color="FFFFFF")
-            
-            student_font = Font(size=9, color="000000")
-            center_align = Alignment(horizontal='center', vertical='center', wrap_text=True)
-            
-            # Find all section headers, window rows, door rows, and column headers
-            room_header_rows = []
-            section_header_rows = []
-            window_rows = []
-            door_rows = []
-            col_header_rows = []
-            
-            for row_idx in range(1, max_row + 1):
-                for col_idx in range(1, max_col + 1):
-                    cell = worksheet.cell(row=row_idx, column=col_idx)
-                    cell_value = str(cell.value).strip() if cell.value else ''
-                    
-                    if 'Room:' in cell_value and row_idx not in room_header_rows:
-                        room_header_rows.append(row_idx)
-                    if (('Saturday' in cell_value or 'Monday' in cell_value or 'Tuesday' in cell_value or 
-                         'Wednesday' in cell_value or 'Thursday' in cell_value or 'Friday' in cell_value) and 
-                        ('FN' in cell_value or 'AN' in cell_value)) and row_idx not in section_header_rows:
-                        section_header_rows.append(row_idx)
-                    if 'WINDOW' in cell_value.upper() and row_idx not in window_rows:
-                        window_rows.append(row_idx)
-                    if 'Door' in cell_value and row_idx not in door_rows:
-                        door_rows.append(row_idx)
-                    if ('COL1' in cell_value or 'COL2' in cell_value or 'COL3' in cell_value or 'COL4' in cell_value) and row_idx not in col_header_rows:
-                        col_header_rows.append(row_idx)
-            
-            # Format room header rows
-            for row_idx in room_header_rows:
-                for col_idx in range(1, max_col + 1):
-                    cell = worksheet.cell(row=row_idx, column=col_idx)
-                    if cell.value:
-                        cell.fill = room_header_fill
-                        cell.font = room_header_font
-                        cell.alignment = center_align
-            
-            # Format section header rows
-            for row_idx in section_header_rows:
-                for col_idx in range(1, max_col + 1):
-                    cell = worksheet.cell(row=row_idx, column=col_idx)
-                    if cell.value:
-                        cell.fill = section_header_fill
-                        cell.font = section_header_font
-                        cell.alignment = center_align
-            
-            # Format WINDOW rows
-            for row_idx in window_rows:
-                for col_idx in range(1, max_col + 1):
-                    cell = worksheet.cell(row=row_idx, column=col_idx)
-                    cell.fill = window_fill
-                    cell.font = window_font
-                    cell.alignment = center_align
-            
-            # Format Door rows
-            for row_idx in door_rows:
-                for col_idx in range(1, max_col + 1):
-                    cell = worksheet.cell(row=row_idx, column=col_idx)
-                    cell.fill = door_fill
-                    cell.font = door_font
-                    cell.alignment = center_align
-            
-            # Format column headers
-            for row_idx in col_header_rows:
-                for col_idx in range(1, max_col + 1):
-                    cell = worksheet.cell(row=row_idx, column=col_idx)
-                    cell_value = str(cell.value).strip() if cell.value else ''
-                    if 'COL1' in cell_value or 'COL2' in cell_value or 'COL3' in cell_value or 'COL4' in cell_value:
-                        cell.fill = col_header_fill
-                        cell.font = col_header_font
-                        cell.alignment = center_align
-            
-            # Format student data rows
-            # Find data rows (between col headers and doors, excluding section headers)
-            processed_rows = set(room_header_rows + section_header_rows + window_rows + door_rows + col_header_rows)
-            
-            for row_idx in range(1, max_row + 1):
-                if row_idx in processed_rows:
-                    continue
-                
-                for col_idx in range(1, max_col + 1):
-                    cell = worksheet.cell(row=row_idx, column=col_idx)
-                    cell_value = str(cell.value).strip() if cell.value else ''
-                    
-                    # Skip empty cells
-                    if not cell_value:
-                        continue
-                    
-                    # Determine which column group this belongs to
-                    # COL1 is columns 2-3, COL2 is columns 4-5, COL3 is columns 6-7, COL4 is columns 8-9
-                    if col_idx in [2, 3]:  # COL1
-                        cell.fill = col1_fill
-                        cell.font = student_font
-                        cell.alignment = center_align
-                    elif col_idx in [4, 5]:  # COL2
-                        cell.fill = col2_fill
-                        cell.font = student_font
-                        cell.alignment = center_align
-                    elif col_idx in [6, 7]:  # COL3
-                        cell.fill = col3_fill
-                        cell.font = student_font
-                        cell.alignment = center_align
-                    elif col_idx in [8, 9]:  # COL4
-                        cell.fill = col4_fill
-                        cell.font = student_font
-                        cell.alignment = center_align
-            
-            # Set column widths
-            worksheet.column_dimensions[get_column_letter(1)].width = 20  # First column (labels)
-            for col_idx in range(2, max_col + 1):
-                col_letter = get_column_letter(col_idx)
-                worksheet.column_dimensions[col_letter].width = 12  # Student roll number columns
-            
-            # Set row heights
-            for row_idx in room_header_rows:
-                worksheet.row_dimensions[row_idx].height = 30
-            for row_idx in section_header_rows:
-                worksheet.row_dimensions[row_idx].height = 22
-            for row_idx in window_rows:
-                worksheet.row_dimensions[row_idx].height = 25
-            for row_idx in door_rows:
-                worksheet.row_dimensions[row_idx].height = 22
-            for row_idx in col_header_rows:
-                worksheet.row_dimensions[row_idx].height = 18
-            
-            # Set row heights for data rows
-            for row_idx in range(1, max_row + 1):
-                if row_idx not in processed_rows:
-                    worksheet.row_dimensions[row_idx].height = 18
-            
-        except Exception as e:
-            print(f"    WARNING: Could not format seating sheet: {e}")
+    def _register_seating_styles(self, workbook):
+        """Add the seating sheet cell styles to a workbook as named styles (written once to styles.xml)."""
+        for name, (fill, font) in _SEATING_STYLES.items():
+            workbook.add_named_style(NamedStyle(name=name, font=font, fill=fill, alignment=_CENTER_ALIGN))
+    
+    def _write_seating_sheet(self, workbook, sheet_name, sheet, row_kinds):
+        """Append one room's seating sheet to a write-only workbook, styling cells as they are written.
+        The workbook must have the _register_seating_styles named styles."""
+        worksheet = workbook.create_sheet(title=sheet_name)
+        max_col = sheet.shape[1]
+        
+        # Row kinds come from _create_seating_sheet, as per-row lists indexed by the 1-based row:
+        # label rows -> (named style, only cells with a value, row height); column header flags
+        label_styles = [None] * (len(sheet) + 1)
+        for row_idx in row_kinds['room']:
+            label_styles[row_idx] = ('seating_room_header', True, 30)
+        for row_idx in row_kinds['section']:
+            label_styles[row_idx] = ('seating_section_header', True, 22)
+        for row_idx in row_kinds['window']:
+            label_styles[row_idx] = ('seating_window', False, 25)
+        for row_idx in row_kinds['door']:
+            label_styles[row_idx] = ('seating_door', False, 22)
+        col_header_rows = bytearray(len(sheet) + 1)
+        for row_idx in row_kinds['col_header']:
+            col_header_rows[row_idx] = 1
+        
+        # COL1 is columns 2-3, COL2 is columns 4-5, COL3 is columns 6-7, COL4 is columns 8-9
+        # (indexed by 1-based column; the label column is unstyled)
+        data_styles = (None, None) + tuple(f'seating_col{group}' for group in (1, 2, 3, 4) for _ in range(2))
+        
+        def styled(value, style_name):
+            cell = WriteOnlyCell(worksheet, value=value)
+            cell.style = style_name
+            return cell
+        
+        # Column widths and row heights must be set before rows are streamed
+        worksheet.column_dimensions[_COL_LETTERS[1]].width = 20  # First column (labels)
+        # Student roll number columns: one <col> entry spanning B..last column
+        worksheet.column_dimensions[_COL_LETTERS[2]] = ColumnDimension(
+            worksheet, index=_COL_LETTERS[2], min=2, max=max_col, width=12)
+        # Rows default to 18 points; only the taller label rows get their own RowDimension
+        worksheet.sheet_format.defaultRowHeight = 18
+        worksheet.sheet_format.customHeight = True
+        for row_idx, style in enumerate(label_styles):
+            if style is not None:
+                worksheet.row_dimensions[row_idx].height = style[2]
+        
+        for row_idx, values in enumerate(sheet, start=1):
+            style = label_styles[row_idx]
+            if style is not None:
+                style_name, only_filled, _ = style
+                row = [styled(value, style_name) if value or not only_filled else value for value in values]
+            elif col_header_rows[row_idx]:
+                # Format column headers
+                row = [styled(value, 'seating_col_header')
+                       if value in ('COL1', 'COL2', 'COL3', 'COL4') else value for value in values]
+            elif not any(values):
+                # Blank spacer rows have nothing to style
+                row = list(values)
+            else:
+                # Student data rows: colour non-empty cells by their column group
+                row = [styled(value, style_name) if style_name and value else value
+                       for value, style_name in zip(values, data_styles[1:])]
+            worksheet.append(row)
     
     def generate_seating_arrangements(self):
         """Generate seating arrangements for all exam classrooms."""
@@ -716,9 +569,8 @@ class SeatingArrangementGenerator:
             print("ERROR: No student data available")
             return False
         
-        # Get all exam days and sessions
-        exam_days = ['Saturday', 'Monday', 'Tuesday', 'Wednesday', 'Thursday', 'Friday', 'Monday']
-        sessions = ['FN', 'AN']
+        # Get all exam days (sessions come from _DAY_SESSIONS)
+        exam_days = self._EXAM_DAYS
         
         filename = "seating arrangement.xlsx"
         filepath = os.path.join(OUTPUT_DIR, filename)
@@ -727,57 +579,52 @@ class SeatingArrangementGenerator:
         os.makedirs(OUTPUT_DIR, exist_ok=True)
         
         try:
-            writer = pd.ExcelWriter(filepath, engine='openpyxl')
+            # Write-only workbook: rows are streamed out with their styles, not kept as a cell model
+            workbook = Workbook(write_only=True)
+            self._register_seating_styles(workbook)
             
             sheets_created = 0
             
-            with writer as w:
-                # Pre-compute students for each day/session (cache to avoid repeated lookups)
-                students_cache = {}
-                for day in exam_days:
-                    for session in sessions:
-                        students = self._get_students_for_exam(day, session)
-                        students_cache[(day, session)] = students
-                
-                print(f"  Generating one sheet per room (total: {len(self.exam_classrooms)} rooms)")
+            # Seat each exam slot once across all rooms: its students are shuffled a single time
+            # and every room takes its benches from the students not seated in earlier rooms
+            seating_by_room = defaultdict(dict)
+            for key in dict.fromkeys(self._DAY_SESSIONS):
+                students = list(self._get_students_for_exam(*key))
+                random.shuffle(students)  # Randomize for better distribution
+                for room_name, seating_df in self._seat_exam_slot(students).items():
+                    seating_by_room[room_name][key] = seating_df
+            
+            print(f"  Generating one sheet per room (total: {len(self.exam_classrooms)} rooms)")
+            
+            for room_name in self.exam_classrooms:
+                # Seating data for all day/session combinations for this room
+                seating_data_by_day_session = seating_by_room.get(room_name)
                 
-                for room_name in self.exam_classrooms:
-                    capacity = self.classroom_capacities.get(room_name, 50)
+                # Create one combined sheet for this room
+                if seating_data_by_day_session:
+                    sheet, row_kinds = self._create_seating_sheet(room_name, seating_data_by_day_session, exam_days)
                     
-                    # Collect seating data for all day/session combinations for this room
-                    seating_data_by_day_session = {}
+                    # Sheet name is just the room name
+                    sheet_name = room_name
+                    # Excel sheet name limit is 31 characters
+                    if len(sheet_name) > 31:
+                        sheet_name = sheet_name[:31]
                     
-                    for day in exam_days:
-                        for session in sessions:
-                            # Use cached students list
-                            students = students_cache[(day, session)]
-                            # Generate seating for this room, day, session
-                            seating_df = self._generate_seating_for_room_with_students(room_name, capacity, students)
-                            if not seating_df.empty:
-                                seating_data_by_day_session[(day, session)] = seating_df
+                    # Write the sheet with its color coding and formatting
+                    self._write_seating_sheet(workbook, sheet_name, sheet, row_kinds)
                     
-                    # Create one combined sheet for this room
-                    if seating_data_by_day_session:
-                        sheet_df = self._create_seating_sheet(room_name, seating_data_by_day_session, exam_days)
-                        
-                        # Sheet name is just the room name
-                        sheet_name = room_name
-                        # Excel sheet name limit is 31 characters
-                        if len(sheet_name) > 31:
-                            sheet_name = sheet_name[:31]
-                        
-                        sheet_df.to_excel(w, sheet_name=sheet_name, index=False, header=False)
-                        
-                        # Apply color coding and formatting
-                        try:
-                            ws = w.sheets[sheet_name]
-                            self._format_seating_sheet(ws, room_name, None, None)
-                        except Exception as e:
-                            print(f"    WARNING: Could not format sheet {sheet_name}: {e}")
-                        
-                        sheets_created += 1
-                        if sheets_created % 5 == 0:
-                            print(f"  Created {sheets_created} sheets...")
+                    sheets_created += 1
+                    if sheets_created % 5 == 0:
+                        print(f"  Created {sheets_created} sheets...")
+            
+            if sheets_created == 0:
+                print("ERROR: No seating sheets to write")
+                return False
+            # Serialize in memory, then write the file with one large write
+            buffer = io.BytesIO()
+            workbook.save(buffer)
+            with open(filepath, 'wb') as f:
+                f.write(buffer.getbuffer())
             
             print(f"\nSUCCESS: Created seating arrangement file")
             print(f"  File: {filepath}")